@@ -1,10 +1,13 @@
 """The BLE Battery Management System integration."""
 
 from dataclasses import dataclass
+from functools import partial
+from shutil import rmtree
 from types import ModuleType
 from typing import Any, Final
 
 from aiobmsble import BMSConfig
+from aiobmsble.basebms import BaseBMS
 from bleak.backends.device import BLEDevice
 
 from homeassistant.components.bluetooth import async_ble_device_from_address
@@ -12,23 +15,51 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
-from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.device_registry import format_mac
 from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers.typing import ConfigType
 
+from .bank import async_setup_bank, is_bank
 from .config_flow import ConfigFlow
-from .const import CONF_ADVANCED_OPTIONS, CONF_KEEP_ALIVE, DOMAIN, LOGGER
+from .const import (
+    CONF_ADVANCED_OPTIONS,
+    CONF_FAST_SETUP,
+    CONF_KEEP_ALIVE,
+    CONF_MEMBERS,
+    DOMAIN,
+    LOGGER,
+)
 from .coordinator import BTBmsCoordinator
+from .metrics import MetricsView
+from .services import async_setup_services
+from .store import BmsStore, archive_path
+from .websocket import async_setup_websocket
 
 PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+BANK_PLATFORMS: list[Platform] = [Platform.SENSOR]
+CONFIG_SCHEMA: Final = cv.config_entry_only_config_schema(DOMAIN)
 
 type BTBmsConfigEntry = ConfigEntry[BTBmsCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the actions, websocket commands and metrics of the integration."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    hass.http.register_view(MetricsView())
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: BTBmsConfigEntry) -> bool:
     """Set up BT Battery Management System from a config entry."""
     LOGGER.debug("Setup of %r", entry)
 
+    if is_bank(entry):
+        await async_setup_bank(hass, entry)
+        await hass.config_entries.async_forward_entry_setups(entry, BANK_PLATFORMS)
+        return True
+
     if entry.unique_id is None:
         raise ConfigEntryError(
             translation_domain=DOMAIN,
@@ -54,23 +85,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: BTBmsConfigEntry) -> boo
 
     plugin: ModuleType = await async_import_module(hass, entry.data["type"])
     advanced_options: dict[str, Any] = entry.options.get(CONF_ADVANCED_OPTIONS, {})
+    bms_config: Final[BMSConfig] = BMSConfig(
+        keep_alive=advanced_options.get(CONF_KEEP_ALIVE, True),
+        secret=entry.options.get(CONF_PASSWORD, ""),
+    )
+
+    def bms_factory(device: BLEDevice) -> BaseBMS:
+        """Create the BMS reached via the given Bluetooth device."""
+        return plugin.BMS(device, bms_config)
+
     coordinator = BTBmsCoordinator(
         hass,
         ble_device,
-        plugin.BMS(
-            ble_device,
-            BMSConfig(
-                keep_alive=advanced_options.get(CONF_KEEP_ALIVE, True),
-                secret=entry.options.get(CONF_PASSWORD, ""),
-            ),
-        ),
+        bms_factory(ble_device),
         entry,
+        bms_factory,
     )
 
     # Query the device the first time, initialise coordinator.data
     started = False
     try:
-        await coordinator.async_config_entry_first_refresh()
+        if await coordinator.async_restore() and advanced_options.get(
+            CONF_FAST_SETUP, False
+        ):
+            # entities are created from the restored sample, query device afterwards
+            entry.async_create_background_task(
+                hass, coordinator.async_start(), f"{DOMAIN} start {entry.title}"
+            )
+        else:
+            try:
+                await coordinator.async_config_entry_first_refresh()
+            except ConfigEntryNotReady:
+                # entities show the restored sample until the device answers
+                if coordinator.restored is None:
+                    raise
+                LOGGER.debug("%s: using restored sample", entry.title)
+                # setup and background loops are not started by a failed refresh
+                entry.async_create_background_task(
+                    hass, coordinator.async_start(), f"{DOMAIN} start {entry.title}"
+                )
         entry.runtime_data = coordinator
         started = True
     finally:
@@ -84,6 +137,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: BTBmsConfigEntry) -> boo
 
 async def async_unload_entry(hass: HomeAssistant, entry: BTBmsConfigEntry) -> bool:
     """Unload a config entry."""
+    if is_bank(entry):
+        return await hass.config_entries.async_unload_platforms(entry, BANK_PLATFORMS)
+
     unload_ok: Final = await hass.config_entries.async_unload_platforms(
         entry, PLATFORMS
     )
@@ -92,9 +148,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: BTBmsConfigEntry) -> bo
     if unload_ok and getattr(entry, "runtime_data", None) is not None:
         await entry.runtime_data.async_shutdown()
 
+    # banks refer to the coordinator of this entry, set them up again
+    for bank in hass.config_entries.async_loaded_entries(DOMAIN):
+        if entry.entry_id in bank.data.get(CONF_MEMBERS, []):
+            hass.config_entries.async_schedule_reload(bank.entry_id)
+
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: BTBmsConfigEntry) -> None:
+    """Remove the persisted data of a config entry."""
+    await BmsStore(hass, entry.entry_id).async_remove()
+    await hass.async_add_executor_job(
+        partial(rmtree, archive_path(hass, entry.entry_id), ignore_errors=True)
+    )
+
+
 async def async_migrate_entry(
     hass: HomeAssistant, config_entry: BTBmsConfigEntry
 ) -> bool:
@@ -0,0 +1,107 @@
+"""Aggregation of oversampled BMS data for BLE Battery Management System integration."""
+
+from collections import deque
+from datetime import UTC, datetime, timedelta
+from time import monotonic
+from typing import Any, Final, cast
+
+from aiobmsble import BMSSample
+
+
+class SampleAggregator:
+    """Running aggregate of the samples taken between two published updates."""
+
+    # fields published as mean with their extremes, all others as latest value
+    MEAN_FIELDS: Final[tuple[str, ...]] = ("current", "power", "temperature", "voltage")
+
+    __slots__ = ("_count", "_last", "_max", "_min", "_samples", "_sum")
+
+    def __init__(self) -> None:
+        """Initialize an empty aggregate."""
+        self._reset()
+
+    def _reset(self) -> None:
+        self._samples: int = 0
+        self._last: BMSSample = {}
+        self._count: dict[str, int] = {}
+        self._sum: dict[str, float] = {}
+        self._min: dict[str, float] = {}
+        self._max: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of aggregated samples."""
+        return self._samples
+
+    def add(self, sample: BMSSample) -> None:
+        """Add a sample to the aggregate."""
+
+        values: Final = cast("dict[str, float]", sample)
+        for key in self.MEAN_FIELDS:
+            if (value := values.get(key)) is None:
+                continue
+            if key in self._count:
+                self._count[key] += 1
+                self._sum[key] += value
+                self._min[key] = min(self._min[key], value)
+                self._max[key] = max(self._max[key], value)
+            else:
+                self._count[key] = 1
+                self._sum[key] = self._min[key] = self._max[key] = value
+        self._last = sample
+        self._samples += 1
+
+    def pop(self) -> tuple[BMSSample, dict[str, tuple[float, float]]]:
+        """Return the aggregated sample and extremes per field, then reset."""
+
+        result: Final = cast("dict[str, float]", dict(self._last))
+        for key in self.MEAN_FIELDS:
+            if key in result:
+                result[key] = self._sum[key] / self._count[key]
+        extremes: Final = {
+            key: (self._min[key], self._max[key])
+            for key in self.MEAN_FIELDS
+            if key in result
+        }
+        self._reset()
+        return cast("BMSSample", result), extremes
+
+
+class BurstCapture:
+    """Bounded buffer of all samples taken during a limited time."""
+
+    SAMPLES: Final[int] = 3600  # capacity of the buffer
+
+    __slots__ = ("_samples", "_until")
+
+    def __init__(self) -> None:
+        """Initialize an inactive capture."""
+        self._samples: Final[deque[tuple[datetime, BMSSample]]] = deque(
+            maxlen=self.SAMPLES
+        )
+        self._until: float | None = None  # monotonic end of the capture
+
+    def __len__(self) -> int:
+        """Return the number of captured samples."""
+        return len(self._samples)
+
+    @property
+    def active(self) -> bool:
+        """Return whether samples are currently captured."""
+        return self._until is not None and monotonic() < self._until
+
+    def start(self, duration: timedelta) -> None:
+        """Discard the previous capture and capture samples for the given time."""
+        self._samples.clear()
+        self._until = monotonic() + duration.total_seconds()
+
+    def add(self, sample: BMSSample) -> None:
+        """Add a sample if the capture is active."""
+        if self.active:
+            self._samples.append((datetime.now(UTC), sample))
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the captured samples with their timestamps."""
+        return [
+            {"timestamp": timestamp.isoformat(), "sample": sample}
+            for timestamp, sample in self._samples
+        ]
@@ -0,0 +1,206 @@
+"""On-disk sample archive for BLE Battery Management System integration."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import pairwise
+from math import inf, isnan, nan
+import mmap
+from pathlib import Path
+import struct
+from time import time
+from typing import Final, cast, override
+
+from aiobmsble import BMSSample
+
+from .history import SampleHistory
+from .writer import BatchWriter
+
+HEADER: Final = struct.Struct("<4sHH")  # magic, version, number of cells
+MAGIC: Final[bytes] = b"BMSA"
+VERSION: Final[int] = 1
+
+
+class SampleArchive(BatchWriter[bytes]):
+    """Append-only segment files of fixed-width sample records of one BMS.
+
+    A record holds the POSIX timestamp (double) and the numeric fields and
+    cell voltages (single precision).
+    """
+
+    FIELDS: Final = SampleHistory.FIELDS
+    MAX_CELLS: Final = SampleHistory.MAX_CELLS
+    SEGMENT_SPAN: Final[int] = 86400  # [s] time span of a segment file
+
+    __slots__ = ("_cells", "_path", "_retention", "_segment")
+
+    def __init__(self, path: Path, retention: float) -> None:
+        """Initialize the archive in a directory keeping records for a time [s]."""
+
+        super().__init__()
+        self._path: Final[Path] = path
+        self._retention: Final[float] = retention
+        self._cells: int = 0  # cell voltages per pending record
+        self._segment: tuple[Path, int, float] | None = None  # file, cells, start
+
+    @staticmethod
+    def _record(cells: int) -> struct.Struct:
+        """Return the record layout for a number of cells."""
+        return struct.Struct(f"<d{len(SampleArchive.FIELDS) + cells}f")
+
+    @override
+    def add(self, sample: BMSSample, now: float | None = None) -> None:
+        """Pack a sample taken at the given POSIX time, default is now."""
+
+        values: Final = cast("dict[str, float]", sample)
+        cells: Final[list[float]] = sample.get("cell_voltages", [])[: self.MAX_CELLS]
+        if not self._pending:
+            # all records of a batch have the cell count of its first cell data
+            self._cells = len(cells) or self._cells
+        self._append(
+            self._record(self._cells).pack(
+                time() if now is None else now,
+                *(
+                    nan if (val := values.get(key)) is None else val
+                    for key in self.FIELDS
+                ),
+                *cells[: self._cells],
+                *[nan] * (self._cells - len(cells)),
+            )
+        )
+
+    @override
+    def _write(self, records: list[bytes]) -> None:
+        """Append a batch of records to the current segment."""
+
+        now: Final[float] = time()
+        cells: Final[int] = (len(records[0]) - 8) // 4 - len(self.FIELDS)
+        with self._open_segment(cells, now).open("ab") as file:
+            file.write(b"".join(records))
+        self._prune(now)
+
+    def _open_segment(self, cells: int, now: float) -> Path:
+        """Return the segment file for records with a number of cells."""
+
+        if self._segment is None and (segments := self._segments()):
+            # continue the latest segment after a restart, drop a partial record
+            start, path = segments[-1]
+            with path.open("rb+") as file:
+                # a truncated or foreign header starts a new segment
+                header: bytes = file.read(HEADER.size)
+                magic, version, seg_cells = (
+                    HEADER.unpack(header) if len(header) == HEADER.size else (b"", 0, 0)
+                )
+                if magic == MAGIC and version == VERSION:
+                    size: int = path.stat().st_size - HEADER.size
+                    file.truncate(
+                        HEADER.size + size - size % self._record(seg_cells).size
+                    )
+                    self._segment = (path, seg_cells, start)
+        if (
+            self._segment is not None
+            and self._segment[1] == cells
+            and now - self._segment[2] < self.SEGMENT_SPAN
+        ):
+            return self._segment[0]
+        self._path.mkdir(parents=True, exist_ok=True)
+        seg_start: int = int(now)
+        while (path := self._path / f"{seg_start}.bin").exists():
+            seg_start += 1
+        path.write_bytes(HEADER.pack(MAGIC, VERSION, cells))
+        self._segment = (path, cells, seg_start)
+        return path
+
+    def _segments(self) -> list[tuple[float, Path]]:
+        """Return the segment files with their start time, oldest first."""
+
+        if not self._path.is_dir():
+            return []
+        return sorted(
+            (int(path.stem), path)
+            for path in self._path.glob("*.bin")
+            if path.stem.isdecimal()
+        )
+
+    def _prune(self, now: float) -> None:
+        """Delete segments whose records all exceed the retention time."""
+
+        segments: Final = self._segments()
+        for (_start, path), (next_start, _next) in pairwise(segments):
+            if next_start >= now - self._retention:
+                break
+            path.unlink(missing_ok=True)
+
+    def series(
+        self, column: str | int, start: float = 0, end: float = inf
+    ) -> tuple[array[float], array[float]]:
+        """Return timestamps and values of a field or cell within a time range.
+
+        Reads the segment files via memory maps, blocking. Records that did
+        not contain the value are left out.
+        """
+
+        times: Final = array("d")
+        values: Final = array("f")
+        segments: Final = self._segments()
+        for idx, (_start, path) in enumerate(segments):
+            if idx + 1 < len(segments) and segments[idx + 1][0] < start:
+                continue  # records of a segment are older than the next one
+            with self._lock, path.open("rb") as file:
+                if path.stat().st_size <= HEADER.size:
+                    continue
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for stamp, value in self._read(data, column, start, end):
+                        if not isnan(value):
+                            times.append(stamp)
+                            values.append(value)
+        return times, values
+
+    def _read(
+        self, data: mmap.mmap, column: str | int, start: float, end: float
+    ) -> list[tuple[float, float]]:
+        """Return timestamps and values of the records of a segment in a range."""
+
+        magic, version, cells = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return []
+        if isinstance(column, str):
+            offset: int = self.FIELDS.index(column)
+        elif column < cells:
+            offset = len(self.FIELDS) + column
+        else:
+            return []
+        width: Final[int] = self._record(cells).size
+        count: Final[int] = (len(data) - HEADER.size) // width
+        # layout that skips all values but the requested one
+        layout: Final = struct.Struct(f"<d{4 * offset}xf{width - 12 - 4 * offset}x")
+        stamps: Final = _Timestamps(data, width, count)
+        first: Final[int] = bisect_left(stamps, start)
+        last: Final[int] = bisect_right(stamps, end)
+        with (
+            memoryview(data) as view,
+            view[HEADER.size + first * width : HEADER.size + last * width] as records,
+        ):
+            return list(layout.iter_unpack(records))
+
+
+class _Timestamps:
+    """Sequence of the record timestamps of a segment for bisection."""
+
+    __slots__ = ("_count", "_data", "_width")
+
+    def __init__(self, data: mmap.mmap, width: int, count: int) -> None:
+        """Initialize the timestamps of a number of records with a width."""
+        self._data: Final = data
+        self._width: Final[int] = width
+        self._count: Final[int] = count
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return self._count
+
+    def __getitem__(self, idx: int) -> float:
+        """Return the timestamp of a record."""
+        return cast(
+            "float",
+            struct.unpack_from("<d", self._data, HEADER.size + idx * self._width)[0],
+        )
@@ -0,0 +1,205 @@
+"""Battery bank aggregating multiple BMS of the BLE Battery Management System integration."""
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Final, override
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    ATTR_BATTERY_LEVEL,
+    ATTR_CURRENT,
+    ATTR_CYCLE_CAP,
+    ATTR_MAX_VOLTAGE,
+    ATTR_MIN_VOLTAGE,
+    ATTR_POWER,
+    BANK_TYPE,
+    CONF_MEMBERS,
+    DOMAIN,
+    LOGGER,
+)
+from .coordinator import BTBmsCoordinator
+
+type BTBankConfigEntry = ConfigEntry[BTBankCoordinator]
+
+
+@callback
+def is_bank(entry: ConfigEntry) -> bool:
+    """Return whether the config entry is a battery bank."""
+    return entry.data.get("type") == BANK_TYPE
+
+
+@dataclass(frozen=True, slots=True)
+class _Contribution:
+    """Values a single member contributes to the bank totals."""
+
+    current: float
+    power: float
+    energy: float
+    level: float  # state of charge weighted by capacity
+    weight: float  # capacity of the member
+    plain_level: float  # state of charge
+    levels: int  # member reports its state of charge
+    unweighted: int  # member reports its state of charge without a capacity
+    cell_min: float | None
+    cell_max: float | None
+
+
+class BTBankCoordinator(DataUpdateCoordinator[dict[str, float]]):
+    """Coordinator deriving battery bank values from its member BMS coordinators."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        members: dict[str, BTBmsCoordinator],
+    ) -> None:
+        """Initialize battery bank coordinator."""
+        super().__init__(
+            hass=hass,
+            logger=LOGGER,
+            name=config_entry.title,
+            update_interval=None,  # updated by the members
+            always_update=False,
+            config_entry=config_entry,
+        )
+        self._members: Final = members
+        self._contrib: dict[str, _Contribution] = {}
+        # running sums of the contributions of all available members
+        self._current: float = 0
+        self._power: float = 0
+        self._energy: float = 0
+        self._level: float = 0
+        self._weight: float = 0
+        self._plain_level: float = 0
+        self._levels: int = 0
+        self._unweighted: int = 0
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config_entry.title,
+            model="Battery bank",
+        )
+
+    @property
+    def members(self) -> dict[str, BTBmsCoordinator]:
+        """Return the coordinators of the bank members by config entry ID."""
+        return self._members
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Listen to updates of the members and return a callback to stop."""
+
+        unsubs: Final[list[CALLBACK_TYPE]] = [
+            member.async_add_listener(partial(self._async_member_update, entry_id))
+            for entry_id, member in self._members.items()
+        ]
+        for entry_id in self._members:
+            self._async_member_update(entry_id)
+
+        @callback
+        def _async_stop() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _async_stop
+
+    @staticmethod
+    def _contribution(member: BTBmsCoordinator) -> _Contribution | None:
+        """Return what an available member contributes to the bank."""
+
+        if not member.last_update_success or not (data := member.data):
+            return None
+        capacity: Final[float] = data.get("design_capacity") or 0
+        levels: Final[int] = int("battery_level" in data)
+        cells: Final[list[float]] = data.get("cell_voltages", [])
+        return _Contribution(
+            current=data.get("current", 0),
+            power=data.get("power", 0),
+            energy=data.get("cycle_capacity", 0),
+            level=data.get("battery_level", 0) * capacity,
+            weight=capacity * levels,
+            plain_level=data.get("battery_level", 0),
+            levels=levels,
+            unweighted=int(levels and not capacity),
+            cell_min=min(cells) if cells else None,
+            cell_max=max(cells) if cells else None,
+        )
+
+    def _add(self, contrib: _Contribution, sign: int) -> None:
+        self._current += sign * contrib.current
+        self._power += sign * contrib.power
+        self._energy += sign * contrib.energy
+        self._level += sign * contrib.level
+        self._weight += sign * contrib.weight
+        self._plain_level += sign * contrib.plain_level
+        self._levels += sign * contrib.levels
+        self._unweighted += sign * contrib.unweighted
+
+    @callback
+    def _async_member_update(self, entry_id: str) -> None:
+        """Replace the contribution of the updated member and publish the bank."""
+
+        if (old := self._contrib.pop(entry_id, None)) is not None:
+            self._add(old, -1)
+        if (new := self._contribution(self._members[entry_id])) is not None:
+            self._add(new, 1)
+            self._contrib[entry_id] = new
+        self.async_set_updated_data(self._bank_data())
+
+    def _bank_data(self) -> dict[str, float]:
+        """Return the values of the bank from the running sums."""
+
+        if not self._contrib:
+            return {}
+        data: dict[str, float] = {
+            ATTR_CURRENT: round(self._current, 3),
+            ATTR_POWER: round(self._power, 3),
+            ATTR_CYCLE_CAP: round(self._energy, 3),
+        }
+        if self._unweighted:
+            # capacities of some members are unknown, all count the same
+            data[ATTR_BATTERY_LEVEL] = round(self._plain_level / self._levels, 1)
+        elif self._weight > 0:
+            data[ATTR_BATTERY_LEVEL] = round(self._level / self._weight, 1)
+        if cells := [
+            c.cell_max for c in self._contrib.values() if c.cell_max is not None
+        ]:
+            data[ATTR_MAX_VOLTAGE] = max(cells)
+        if cells := [
+            c.cell_min for c in self._contrib.values() if c.cell_min is not None
+        ]:
+            data[ATTR_MIN_VOLTAGE] = min(cells)
+        return data
+
+    @override
+    async def _async_update_data(self) -> dict[str, float]:
+        """Return the values of the bank, the members are queried by themselves."""
+        return self._bank_data()
+
+
+async def async_setup_bank(hass: HomeAssistant, entry: BTBankConfigEntry) -> None:
+    """Set up the coordinator of a battery bank from its loaded members."""
+
+    members: Final[dict[str, BTBmsCoordinator]] = {}
+    for entry_id in entry.data[CONF_MEMBERS]:
+        if (member := hass.config_entries.async_get_entry(entry_id)) is None:
+            raise ConfigEntryError(
+                translation_domain=DOMAIN,
+                translation_key="bank_member_missing",
+                translation_placeholders={"bank": entry.title},
+            )
+        if member.state is not ConfigEntryState.LOADED:
+            raise ConfigEntryNotReady(
+                translation_domain=DOMAIN,
+                translation_key="bank_member_not_ready",
+                translation_placeholders={"member": member.title},
+            )
+        members[entry_id] = member.runtime_data
+
+    coordinator: Final = BTBankCoordinator(hass, entry, members)
+    entry.async_on_unload(coordinator.async_start())
+    entry.runtime_data = coordinator
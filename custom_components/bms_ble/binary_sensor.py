@@ -141,6 +141,12 @@ class BMSBinarySensor(CoordinatorEntity[BTBmsCoordinator], BinarySensorEntity):
         self.entity_description = descr
         super().__init__(bms)
 
+    @property
+    @override
+    def available(self) -> bool:
+        """Return if entity is available, also while showing a restored sample."""
+        return super().available or self.coordinator.restored is not None
+
     @property
     @override
     def is_on(self) -> bool | None:
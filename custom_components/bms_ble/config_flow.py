@@ -30,6 +30,9 @@ from homeassistant.data_entry_flow import section
 from homeassistant.helpers.device_registry import format_mac
 from homeassistant.helpers.selector import (
     BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
@@ -38,7 +41,42 @@ from homeassistant.helpers.selector import (
     TextSelectorType,
 )
 
-from .const import CONF_ADVANCED_OPTIONS, CONF_KEEP_ALIVE, DOMAIN, LOGGER
+from .const import (
+    BANK_TYPE,
+    CONF_ADAPTIVE_KEEP_ALIVE,
+    CONF_ADVANCED_OPTIONS,
+    CONF_ARCHIVE,
+    CONF_CURRENT_DEADBAND,
+    CONF_EXPORT,
+    CONF_FAST_SETUP,
+    CONF_FRESHNESS,
+    CONF_HISTORY,
+    CONF_KEEP_ALIVE,
+    CONF_MAX_INTERVAL,
+    CONF_MEMBERS,
+    CONF_MIN_INTERVAL,
+    CONF_PUSH_INTERVAL,
+    CONF_PUSH_MODE,
+    CONF_SAMPLE_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    CONF_VOLTAGE_DEADBAND,
+    DOMAIN,
+    LOGGER,
+    MAX_INTERVAL,
+    MIN_INTERVAL,
+    UPDATE_INTERVAL,
+)
+from .export import EXPORT_FORMATS
+
+INTERVAL_SELECTOR: Final = NumberSelector(
+    NumberSelectorConfig(
+        min=MIN_INTERVAL,
+        max=MAX_INTERVAL,
+        step=1,
+        unit_of_measurement="s",
+        mode=NumberSelectorMode.BOX,
+    )
+)
 
 
 @dataclass
@@ -133,13 +171,39 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders=self.context.get("title_placeholders"),
         )
 
+    @callback
+    def _async_battery_entries(self) -> list[ConfigEntry]:
+        """Return the config entries of single batteries, i.e. not of banks."""
+        return [
+            entry
+            for entry in self._async_current_entries(include_ignore=False)
+            if entry.data.get("type") != BANK_TYPE
+        ]
+
     @override
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the user step to pick discovered device."""
+        """Handle the user step to pick discovered device or set up a bank."""
+
+        # a bank requires at least two batteries
+        if user_input is None and len(self._async_battery_entries()) >= 2:
+            return self.async_show_menu(step_id="user", menu_options=["device", "bank"])
+        return await self._async_pick_device(user_input, "user")
+
+    async def async_step_device(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the step to pick discovered device."""
+        return await self._async_pick_device(user_input, "device")
+
+    async def _async_pick_device(
+        self, user_input: dict[str, Any] | None, step_id: str
+    ) -> ConfigFlowResult:
+        """Let the user pick a discovered device."""
         LOGGER.debug(
-            "step user for %s",
+            "step %s for %s",
+            step_id,
             user_input[CONF_ADDRESS] if user_input else "selection",
         )
 
@@ -182,7 +246,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         return self.async_show_form(
-            step_id="user",
+            step_id=step_id,
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_ADDRESS): SelectSelector(
@@ -192,6 +256,48 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
         )
 
+    async def async_step_bank(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the step to combine batteries to a bank."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if len(user_input[CONF_MEMBERS]) < 2:
+                errors["base"] = "bank_members"
+            else:
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={"type": BANK_TYPE, CONF_MEMBERS: user_input[CONF_MEMBERS]},
+                )
+
+        return self.async_show_form(
+            step_id="bank",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): TextSelector(),
+                    vol.Required(CONF_MEMBERS): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                SelectOptionDict(
+                                    value=entry.entry_id, label=entry.title
+                                )
+                                for entry in self._async_battery_entries()
+                            ],
+                            multiple=True,
+                        )
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    @classmethod
+    @callback
+    @override
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        """Return options flow support, banks have no options."""
+        return config_entry.data.get("type") != BANK_TYPE
+
     @staticmethod
     @callback
     @override
@@ -213,8 +319,23 @@ class OptionsFlowHandler(OptionsFlowWithReload):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(data=user_input)
+            advanced: Final = user_input.get(CONF_ADVANCED_OPTIONS, {})
+            if advanced.get(CONF_MIN_INTERVAL, UPDATE_INTERVAL) > advanced.get(
+                CONF_MAX_INTERVAL, UPDATE_INTERVAL
+            ):
+                errors["base"] = "invalid_interval"
+            elif advanced.get(CONF_PUSH_MODE, False) and not advanced.get(
+                CONF_KEEP_ALIVE, True
+            ):
+                errors["base"] = "push_requires_keep_alive"
+            elif advanced.get(CONF_SAMPLE_INTERVAL, 0) >= advanced.get(
+                CONF_MIN_INTERVAL, UPDATE_INTERVAL
+            ):
+                errors["base"] = "invalid_sample_interval"
+            else:
+                return self.async_create_entry(data=user_input)
 
         bms_class: type[BaseBMS] | None = await bms_cls(
             self._bms_type.rsplit(".", 1)[-1]
@@ -238,13 +359,93 @@ class OptionsFlowHandler(OptionsFlowWithReload):
                                 {
                                     vol.Optional(
                                         CONF_KEEP_ALIVE, default=True
-                                    ): BooleanSelector()
+                                    ): BooleanSelector(),
+                                    vol.Optional(
+                                        CONF_ADAPTIVE_KEEP_ALIVE
+                                    ): BooleanSelector(),
+                                    vol.Optional(CONF_MIN_INTERVAL): INTERVAL_SELECTOR,
+                                    vol.Optional(CONF_MAX_INTERVAL): INTERVAL_SELECTOR,
+                                    vol.Optional(
+                                        CONF_SAMPLE_INTERVAL
+                                    ): INTERVAL_SELECTOR,
+                                    vol.Optional(CONF_PUSH_MODE): BooleanSelector(),
+                                    vol.Optional(CONF_PUSH_INTERVAL): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0.5,
+                                            max=60,
+                                            step=0.5,
+                                            unit_of_measurement="s",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_VOLTAGE_DEADBAND): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0,
+                                            max=1,
+                                            step=0.001,
+                                            unit_of_measurement="V",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_CURRENT_DEADBAND): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0,
+                                            max=10,
+                                            step=0.01,
+                                            unit_of_measurement="A",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_TEMP_DEADBAND): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0,
+                                            max=5,
+                                            step=0.1,
+                                            unit_of_measurement="°C",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_FRESHNESS): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0,
+                                            max=MAX_INTERVAL,
+                                            step=1,
+                                            unit_of_measurement="s",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_HISTORY): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0,
+                                            max=168,
+                                            step=1,
+                                            unit_of_measurement="h",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_ARCHIVE): NumberSelector(
+                                        NumberSelectorConfig(
+                                            min=0,
+                                            max=365,
+                                            step=1,
+                                            unit_of_measurement="d",
+                                            mode=NumberSelectorMode.BOX,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_EXPORT): SelectSelector(
+                                        SelectSelectorConfig(
+                                            options=list(EXPORT_FORMATS),
+                                            translation_key=CONF_EXPORT,
+                                        )
+                                    ),
+                                    vol.Optional(CONF_FAST_SETUP): BooleanSelector(),
                                 }
                             ),
                             {"collapsed": True},
                         ),
                     }
                 ),
-                self.config_entry.options,
+                user_input or self.config_entry.options,
             ),
+            errors=errors,
         )
@@ -6,9 +6,73 @@ from typing import Final
 DOMAIN: Final = "bms_ble"
 LOGGER: Final[logging.Logger] = logging.getLogger(__package__)
 LOW_RSSI: Final[int] = -75  # dBm considered low signal strength
+DEFAULT_SLOTS: Final[int] = 3  # connection slots if adapter does not report them
+SLOT_RECHECK: Final[float] = 2.0  # [s] check for slots released by other devices
+SLOT_WAIT: Final[int] = 60  # [s] longest wait for a slot before trying anyway
 UPDATE_INTERVAL: Final[int] = 30  # [s]
 CONF_KEEP_ALIVE: Final[str] = "keep_alive"
 CONF_ADVANCED_OPTIONS: Final[str] = "advanced_options"
+CONF_MIN_INTERVAL: Final[str] = "min_interval"
+CONF_MAX_INTERVAL: Final[str] = "max_interval"
+CONF_PUSH_MODE: Final[str] = "push_mode"
+CONF_PUSH_INTERVAL: Final[str] = "push_interval"
+DEFAULT_PUSH_INTERVAL: Final[float] = 1.0  # [s] minimum time between published samples
+CONF_ADAPTIVE_KEEP_ALIVE: Final[str] = "adaptive_keep_alive"
+CONF_SAMPLE_INTERVAL: Final[str] = "sample_interval"  # oversampling between updates
+CONF_FAST_SETUP: Final[str] = "fast_setup"  # set up from stored sample, query later
+CONF_FRESHNESS: Final[str] = "freshness_window"  # refresh requests use recent sample
+CONF_HISTORY: Final[str] = "history_hours"  # time span of the sample history
+CONF_ARCHIVE: Final[str] = "archive_days"  # retention of the on-disk sample archive
+CONF_EXPORT: Final[str] = "export_format"  # file format of exported samples
+DEFAULT_FRESHNESS: Final[int] = 10  # [s] age of a sample that answers refresh requests
+BANK_TYPE: Final[str] = "bank"  # config entry type of a battery bank
+CONF_MEMBERS: Final[str] = "members"  # config entry IDs of the batteries of a bank
+
+# adaptive polling: rate of change between two samples that is considered significant
+ADAPTIVE_THRESHOLDS: Final[dict[str, float]] = {
+    "battery_level": 0.02,  # [%/s]
+    "current": 0.05,  # [A/s]
+    "power": 1.0,  # [W/s]
+}
+ADAPTIVE_BACKOFF: Final[float] = 1.5  # interval factor for flat samples
+ADAPTIVE_SPEEDUP: Final[float] = 0.5  # interval factor for changing samples
+MIN_INTERVAL: Final[int] = 5  # [s] lower limit for polling interval
+MAX_INTERVAL: Final[int] = 3600  # [s] upper limit for polling interval
+BACKOFF_MAX: Final[int] = 600  # [s] longest delay between updates of a failing BMS
+BACKOFF_JITTER: Final[float] = 0.2  # maximum fraction randomly removed from the delay
+KEEP_ALIVE_CURRENT: Final[float] = 1.0  # [A] battery considered active, keep connection
+KEEP_ALIVE_COST: Final[float] = (
+    0.05  # reconnect time relative to interval worth keeping
+)
+FAILOVER_ERRORS: Final[int] = 3  # consecutive failures before using another source
+SOURCE_HYSTERESIS: Final[int] = 10  # [dB] RSSI gain to switch source on reconnect
+TIMEOUT_FACTOR: Final[float] = 3.0  # safety margin on the 99th percentile latency
+TIMEOUT_MIN: Final[float] = 5.0  # [s] lower limit of the learned update timeout
+TIMEOUT_MAX: Final[float] = 60.0  # [s] upper limit of the learned update timeout
+TIMEOUT_SAMPLES: Final[int] = 20  # updates required before the timeout is learned
+RESTORE_MAX_AGE: Final[int] = 86400  # [s] oldest sample restored after restart
+STORE_DELAY: Final[int] = 60  # [s] minimum time between writes of the latest sample
+INFO_MAX_AGE: Final[int] = 86400  # [s] stored device information is read again
+INFO_RETRY: Final[int] = 3600  # [s] delay to retry reading device information
+BURST_INTERVAL: Final[float] = 1.0  # [s] minimum time between samples of a burst
+HISTORY_HOURS: Final[int] = 24  # [h] default time span of the sample history
+
+# deadband filtering: changes within the configured band do not update entities
+CONF_CURRENT_DEADBAND: Final[str] = "current_deadband"  # [A]
+CONF_TEMP_DEADBAND: Final[str] = "temperature_deadband"  # [°C]
+CONF_VOLTAGE_DEADBAND: Final[str] = "voltage_deadband"  # [V]
+DEADBAND_FIELDS: Final[dict[str, str]] = {
+    "balance_current": CONF_CURRENT_DEADBAND,
+    "cell_voltages": CONF_VOLTAGE_DEADBAND,
+    "current": CONF_CURRENT_DEADBAND,
+    "temp_values": CONF_TEMP_DEADBAND,
+    "temperature": CONF_TEMP_DEADBAND,
+    "voltage": CONF_VOLTAGE_DEADBAND,
+}
+# values calculated from filtered ones, i.e. they follow their changes
+DEADBAND_DERIVED: Final[frozenset[str]] = frozenset(
+    {"cycle_capacity", "delta_voltage", "power", "runtime"}
+)
 
 # attributes (do not change)
 ATTR_BALANCER: Final = "balancer"  # [bool]
@@ -26,18 +90,25 @@ ATTR_CYCLE_CHRG: Final = "cycle_charge"  # [Ah]
 ATTR_CYCLES: Final = "cycles"  # [#]
 ATTR_DELTA_VOLTAGE: Final = "delta_cell_voltage"  # [V]
 ATTR_DESIGN_CAP: Final = "design_capacity"  # [Ah]
+ATTR_DURATION: Final = "duration"  # [min] of a burst capture
 ATTR_DISCHRG_MOSFET: Final = "dischrg_mosfet"  # [bool]
 ATTR_HEATER: Final = "heater"  # [bool]
+ATTR_LATENCY_PUBLISH: Final = "publish_latency"  # [ms]
+ATTR_LATENCY_QUEUE: Final = "queue_latency"  # [ms]
+ATTR_LATENCY_UPDATE: Final = "update_latency"  # [ms]
 ATTR_LQ: Final = "link_quality"  # [%]
+ATTR_MAXIMUM: Final = "maximum"  # extreme of oversampled values
 ATTR_MAX_VOLTAGE: Final = "max_cell_voltage"  # [V]
 ATTR_MIN_VOLTAGE: Final = "min_cell_voltage"  # [V]
+ATTR_MINIMUM: Final = "minimum"  # extreme of oversampled values
 ATTR_POWER: Final = "power"  # [W]
 ATTR_PROBLEM: Final = "problem"  # [bool]
 ATTR_PROBLEM_CODE: Final = "problem_code"  # [str]
+ATTR_RESTORED: Final = "restored"  # timestamp of sample restored after restart
 ATTR_RSSI: Final = "rssi"  # [dBm]
 ATTR_RUNTIME: Final = "runtime"  # [s]
 ATTR_TEMP_SENSORS: Final = "temperature_sensors"  # [°C]
 
 BINARY_SENSORS: Final[int] = 6  # total number of binary sensors
-LINK_SENSORS: Final[int] = 2  # total number of sensors for connection quality
+LINK_SENSORS: Final[int] = 5  # total number of sensors for connection quality
 SENSORS: Final[int] = 13  # total number of sensors
@@ -1,27 +1,98 @@
 """Home Assistant coordinator for BLE Battery Management System integration."""
 
+import asyncio
 from collections import deque
-from datetime import timedelta
-from itertools import islice
+from collections.abc import Callable
+import contextlib
+from datetime import datetime, timedelta
+from random import random
 from time import monotonic
-from typing import Final, override
+from typing import Any, Final, cast, override
+from zlib import crc32
 
-from aiobmsble import BMSSample
+from aiobmsble import BMSInfo, BMSSample
 from aiobmsble.basebms import BaseBMS
 from bleak.backends.device import BLEDevice
 from bleak.exc import BleakError
 
 from homeassistant.components.bluetooth import (
+    SOURCE_LOCAL,
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
     BluetoothServiceInfoBleak,
     async_last_service_info,
+    async_register_callback,
+    async_scanner_devices_by_address,
+    async_track_unavailable,
 )
 from homeassistant.components.bluetooth.const import DOMAIN as BLUETOOTH_DOMAIN
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.signal_type import SignalTypeFormat
+
+from .aggregate import BurstCapture, SampleAggregator
+from .archive import SampleArchive
+from .const import (
+    ADAPTIVE_BACKOFF,
+    ADAPTIVE_SPEEDUP,
+    ADAPTIVE_THRESHOLDS,
+    BACKOFF_JITTER,
+    BACKOFF_MAX,
+    BURST_INTERVAL,
+    CONF_ADAPTIVE_KEEP_ALIVE,
+    CONF_ADVANCED_OPTIONS,
+    CONF_ARCHIVE,
+    CONF_EXPORT,
+    CONF_FRESHNESS,
+    CONF_HISTORY,
+    CONF_KEEP_ALIVE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PUSH_INTERVAL,
+    CONF_PUSH_MODE,
+    CONF_SAMPLE_INTERVAL,
+    DEADBAND_DERIVED,
+    DEADBAND_FIELDS,
+    DEFAULT_FRESHNESS,
+    DEFAULT_PUSH_INTERVAL,
+    DOMAIN,
+    FAILOVER_ERRORS,
+    HISTORY_HOURS,
+    INFO_MAX_AGE,
+    INFO_RETRY,
+    KEEP_ALIVE_COST,
+    KEEP_ALIVE_CURRENT,
+    LOGGER,
+    LOW_RSSI,
+    RESTORE_MAX_AGE,
+    SOURCE_HYSTERESIS,
+    STORE_DELAY,
+    TIMEOUT_FACTOR,
+    TIMEOUT_MAX,
+    TIMEOUT_MIN,
+    TIMEOUT_SAMPLES,
+    UPDATE_INTERVAL,
+)
+from .export import EXPORT_FORMATS, SampleExporter
+from .history import SampleHistory
+from .scheduler import async_get_scheduler
+from .stats import LatencyStats, LinkStats, ewma, percentile
+from .store import BmsStore, StoredData, archive_path, export_path
+from .writer import BatchWriter
+
+# raw samples of a config entry before deadbands are applied
+SIGNAL_SAMPLE: Final = SignalTypeFormat[BMSSample](f"{DOMAIN}_sample_{{}}")
 
-from .const import DOMAIN, LOGGER, LOW_RSSI, UPDATE_INTERVAL
+
+class _BudgetExpired(UpdateFailed):
+    """Update on a kept connection cancelled after its learned time budget."""
 
 
 class BTBmsCoordinator(DataUpdateCoordinator[BMSSample]):
@@ -33,22 +104,101 @@ class BTBmsCoordinator(DataUpdateCoordinator[BMSSample]):
         ble_device: BLEDevice,
         bms_device: BaseBMS,
         config_entry: ConfigEntry,
+        bms_factory: Callable[[BLEDevice], BaseBMS] | None = None,
     ) -> None:
-        """Initialize BMS data coordinator."""
+        """Initialize BMS data coordinator.
+
+        The optional factory creates the BMS for another Bluetooth source on failover.
+        """
+        options: Final = config_entry.options.get(CONF_ADVANCED_OPTIONS, {})
+        self._keep_alive: Final[bool] = options.get(CONF_KEEP_ALIVE, True)
+        # range of the adaptive polling interval and the interval to start with
+        self._min_interval, self._max_interval, self._interval = self._intervals(
+            options
+        )
+        self._rate_ref: tuple[float, BMSSample] | None = None  # time, sample for rates
+        # [s] updates on a kept connection, the timeout budget is learned from
+        self._kept_updates: Final[deque[float]] = deque(maxlen=LatencyStats.SAMPLES)
+        # push mode requires the connection to be kept between updates
+        self._push: Final[bool] = options.get(CONF_PUSH_MODE, False) and options.get(
+            CONF_KEEP_ALIVE, True
+        )
+        self._push_interval: Final[float] = float(
+            options.get(CONF_PUSH_INTERVAL, DEFAULT_PUSH_INTERVAL)
+        )
+        self._unsub_adv: CALLBACK_TYPE | None = None
+        self._backoff: float | None = None  # [s] delay after repeated failures
+        self._failures: int = 0  # consecutive failed updates, bursts excluded
+        self._seen: Final = asyncio.Event()  # device advertised during backoff
+        self._unseen: bool = False  # device stopped advertising since last seen
+        # oversampling: poll faster than the update interval, publish aggregates
+        self._sample_interval: Final[float | None] = (
+            sample_interval
+            if 0
+            < (sample_interval := float(options.get(CONF_SAMPLE_INTERVAL, 0)))
+            < self._min_interval
+            and not self._push
+            else None
+        )
+        # refresh requests are answered by running updates or recent samples
+        self._freshness: Final[float] = float(
+            options.get(CONF_FRESHNESS, DEFAULT_FRESHNESS)
+        )
+        self._updating: asyncio.Event | None = None  # set when running update ends
+        self._burst: Final = BurstCapture()  # all samples for a limited time
+        self._history: Final = SampleHistory.for_span(
+            3600 * options.get(CONF_HISTORY, HISTORY_HOURS),
+            self._sample_interval or self._publish_period(),
+        )
+        # optional files receiving every sample, written in batches in the executor
+        self._archive, self._exporter = self._create_writers(
+            hass, config_entry, ble_device.address
+        )
+        # release the kept connection while idle or if reconnecting is cheap
+        self._adaptive_keep: Final[bool] = (
+            options.get(CONF_ADAPTIVE_KEEP_ALIVE, False)
+            and options.get(CONF_KEEP_ALIVE, True)
+            and not self._push
+        )
+        self._released: bool = True  # next update needs to connect
+        self._fresh_latency: float | None = None  # [s] update including connect
+        self._kept_latency: float | None = None  # [s] update on kept connection
+        self._aggregator: Final = SampleAggregator()
+        self._extremes: dict[str, tuple[float, float]] = {}
+        # changes within these bands per sample field do not update entities
+        self._deadbands: Final[dict[str, float]] = {
+            field: float(options[conf])
+            for field, conf in DEADBAND_FIELDS.items()
+            if options.get(conf)
+        }
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=config_entry.title,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_interval=None if self._push else timedelta(seconds=self._interval),
             always_update=False,  # only update when sensor value has changed
             config_entry=config_entry,
         )
-        self._device: Final = bms_device
-        self._link_q: deque[bool] = deque(
-            [False], maxlen=100
-        )  # track BMS update issues
+        self._device: BaseBMS = bms_device
+        self._bms_factory: Final = bms_factory
+        self._device_source: str | None = None  # source selected on failover
+        self._sources: Final[dict[str, LinkStats]] = {}  # statistics per source
+        self._latency: Final = LatencyStats()  # durations of update phases
+        self._link: Final = LinkStats()  # track BMS update issues
         self._mac: Final = ble_device.address
+        # deterministic phase within the polling interval to spread BMS queries
+        self._phase: Final[float] = crc32(self._mac.encode()) / 2**32
+        self._phased: bool = False  # phase offset has been applied
+        self._scheduler: Final = async_get_scheduler(hass)
         self._stale: bool = False  # indicates no BMS response for significant time
+        self._store: Final = BmsStore(hass, config_entry.entry_id)
+        self._restored: datetime | None = None  # time of sample restored from store
+        self._sample_time: float = 0  # POSIX timestamp of the latest sample
+        self._info: BMSInfo | None = None  # device information, cached in store
+        self._info_time: float | None = None  # POSIX timestamp info was read
+        # background tasks by purpose, i.e. push, oversample, burst or info
+        self._tasks: Final[dict[str, asyncio.Task[None]]] = {}
+        self._query_lock: Final = asyncio.Lock()  # one query of the device at a time
 
         LOGGER.debug(
             "Initializing coordinator for %s (%s) as %s",
@@ -76,26 +226,297 @@ class BTBmsCoordinator(DataUpdateCoordinator[BMSSample]):
         )
         return service_info.rssi if service_info else None
 
+    @property
+    def source(self) -> str:
+        """Return the Bluetooth adapter or proxy the BMS is reached through."""
+
+        if self._device_source is not None:
+            return self._device_source
+        service_info: BluetoothServiceInfoBleak | None = async_last_service_info(
+            self.hass, address=self._mac, connectable=True
+        )
+        return service_info.source if service_info else SOURCE_LOCAL
+
+    @property
+    def source_stats(self) -> dict[str, LinkStats]:
+        """Return statistics of the update attempts per Bluetooth source."""
+        return self._sources
+
     @property
     def link_quality(self) -> int:
         """Gives the percentage of successful BMS reads out of the last 100 attempts."""
 
-        return self._link_q.count(True) * 100 // len(self._link_q)
+        return self._link.quality
+
+    @property
+    def link_stats(self) -> LinkStats:
+        """Return statistics of the BMS update attempts."""
+        return self._link
+
+    @property
+    def latency(self) -> LatencyStats:
+        """Return durations of the phases of recent BMS updates."""
+        return self._latency
+
+    @property
+    def extremes(self) -> dict[str, tuple[float, float]]:
+        """Return minimum and maximum of the oversampled fields of the data."""
+        return self._extremes
+
+    @property
+    def interval_range(self) -> tuple[timedelta, timedelta]:
+        """Return the lower and upper bound of the adaptive polling interval."""
+
+        return (
+            timedelta(seconds=self._min_interval),
+            timedelta(seconds=self._max_interval),
+        )
+
+    @property
+    def backoff(self) -> timedelta | None:
+        """Return the current delay of updates due to repeated failures."""
+        return timedelta(seconds=self._backoff) if self._backoff is not None else None
+
+    @property
+    def history(self) -> SampleHistory:
+        """Return the history of the published samples."""
+        return self._history
+
+    @property
+    def archive(self) -> SampleArchive | None:
+        """Return the on-disk archive of the samples if enabled."""
+        return self._archive
+
+    @property
+    def burst(self) -> BurstCapture:
+        """Return the samples captured by the latest burst."""
+        return self._burst
+
+    @property
+    def adaptive_keep_alive(self) -> bool:
+        """Return whether the coordinator decides on keeping the connection."""
+        return self._adaptive_keep
+
+    @property
+    def connect_cost(self) -> float | None:
+        """Return the additional time [s] an update takes to establish a connection."""
+
+        if self._fresh_latency is None or self._kept_latency is None:
+            return None
+        return max(self._fresh_latency - self._kept_latency, 0)
+
+    @property
+    def timeout(self) -> float | None:
+        """Return the timeout [s] of updates on a kept connection, if learned.
+
+        Updates that connect are not limited, as connecting takes far longer
+        than a query and is limited by the BMS library.
+        """
+
+        if (
+            len(self._kept_updates) < TIMEOUT_SAMPLES
+            or (p99 := percentile(self._kept_updates, 99)) is None
+        ):
+            return None
+        return min(max(p99 * TIMEOUT_FACTOR, TIMEOUT_MIN), TIMEOUT_MAX)
+
+    @property
+    def restored(self) -> datetime | None:
+        """Return the time of the restored sample shown until the first update."""
+        return self._restored
+
+    @property
+    def push_mode(self) -> bool:
+        """Return whether samples are pushed continuously instead of polled."""
+        return self._push
+
+    @property
+    def phase(self) -> timedelta:
+        """Return the offset of the polling schedule derived from the MAC address."""
+        return timedelta(seconds=self._phase * self._interval)
 
     @override
     async def async_shutdown(self) -> None:
         """Shutdown coordinator and any connection."""
         LOGGER.debug("Shutting down BMS (%s)", self.name)
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        if self._unsub_adv is not None:
+            self._unsub_adv()
+            self._unsub_adv = None
         await super().async_shutdown()
+        for writer in (self._archive, self._exporter):
+            if writer is not None:
+                await self._async_write(writer)
+        if self.data or self._info is not None:
+            await self._store.async_save(self._stored_data())
         await self._device.disconnect()
 
+    async def async_start(self) -> None:
+        """Set up the coordinator and query the device outside of the entry setup."""
+
+        try:
+            await self._async_setup()
+        except (BleakError, EOFError, TimeoutError) as err:
+            LOGGER.debug("%s: failed to read device information: %s", self.name, err)
+        else:
+            self._async_update_device_registry()
+        await self.async_refresh()
+
+    async def async_restore(self) -> bool:
+        """Load the device information and seed the data persisted before restart.
+
+        Returns whether a sample was restored.
+        """
+
+        if not (stored := await self._store.async_load()):
+            return False
+        if "device_info" in stored:
+            self._info = stored["device_info"]
+            self._info_time = stored.get("info_timestamp", 0)
+        if "sample" not in stored:
+            return False
+        sample_time: Final = dt_util.utc_from_timestamp(stored.get("timestamp", 0))
+        if dt_util.utcnow() - sample_time > timedelta(seconds=RESTORE_MAX_AGE):
+            LOGGER.debug("%s: stored sample is outdated", self.name)
+            return False
+        LOGGER.debug("%s: restored sample from %s", self.name, sample_time)
+        self.data = stored["sample"]
+        self._restored = sample_time
+        self._sample_time = sample_time.timestamp()
+        # not an update of the device, entities refresh on the first successful one
+        self.last_update_success = False
+        return True
+
+    def _stored_data(self) -> StoredData:
+        stored: StoredData = {}
+        if self.data:
+            stored["sample"] = self.data
+            stored["timestamp"] = self._sample_time
+        if self._info is not None and self._info_time is not None:
+            stored["device_info"] = self._info
+            stored["info_timestamp"] = self._info_time
+        return stored
+
+    @override
+    async def async_request_refresh(self) -> None:
+        """Request a refresh unless an update is running or the sample is recent."""
+
+        if self._updating is not None:
+            LOGGER.debug("%s: refresh request joins running update", self.name)
+            await self._updating.wait()
+            return
+        if (
+            self.last_update_success
+            and dt_util.utcnow().timestamp() - self._sample_time < self._freshness
+        ):
+            LOGGER.debug("%s: refresh request answered by recent sample", self.name)
+            return
+        await super().async_request_refresh()
+
+    @callback
+    def _async_record(self, bms_data: BMSSample) -> None:
+        """Add a new sample to the history and files."""
+        self._history.add(bms_data)
+        for writer in (self._archive, self._exporter):
+            if writer is not None:
+                writer.add(bms_data)
+        self._async_flush()
+
+    @callback
+    def _async_flush(self, _now: datetime | None = None) -> None:
+        """Write the samples of the files whose batch is due in the background.
+
+        Called for new samples and periodically, so that the samples of a
+        silent device are written as well.
+        """
+        assert self.config_entry is not None
+        for writer in (self._archive, self._exporter):
+            if writer is not None and writer.due():
+                self.config_entry.async_create_background_task(
+                    self.hass,
+                    self._async_write(writer),
+                    f"{DOMAIN} write {self.name}",
+                )
+
+    @callback
+    def _async_send(self, bms_data: BMSSample) -> None:
+        """Send a published sample to its subscribers."""
+        assert self.config_entry is not None
+        async_dispatcher_send(
+            self.hass, SIGNAL_SAMPLE.format(self.config_entry.entry_id), bms_data
+        )
+        self._async_schedule_save()
+
+    @staticmethod
+    def _intervals(options: dict[str, Any]) -> tuple[float, float, float]:
+        """Return the minimum, maximum and initial polling interval [s]."""
+
+        min_interval: Final = float(options.get(CONF_MIN_INTERVAL, UPDATE_INTERVAL))
+        max_interval: Final = max(
+            float(options.get(CONF_MAX_INTERVAL, UPDATE_INTERVAL)), min_interval
+        )
+        return (
+            min_interval,
+            max_interval,
+            min(max(UPDATE_INTERVAL, min_interval), max_interval),
+        )
+
+    @staticmethod
+    def _create_writers(
+        hass: HomeAssistant, config_entry: ConfigEntry, mac: str
+    ) -> tuple[SampleArchive | None, SampleExporter | None]:
+        """Return the sample archive and the sample export if enabled.
+
+        Export files are named after the Bluetooth address, as titles can change.
+        """
+
+        options: Final = config_entry.options.get(CONF_ADVANCED_OPTIONS, {})
+        return (
+            SampleArchive(archive_path(hass, config_entry.entry_id), 86400 * days)
+            if (days := options.get(CONF_ARCHIVE, 0))
+            else None,
+            SampleExporter(export_path(hass), slugify(mac), fmt)
+            if (fmt := options.get(CONF_EXPORT)) in EXPORT_FORMATS
+            else None,
+        )
+
+    async def _async_write(self, writer: SampleArchive | SampleExporter) -> None:
+        """Write the pending samples of an archive or export in the executor."""
+        try:
+            await self.hass.async_add_executor_job(writer.write, writer.take())
+        except OSError as err:
+            LOGGER.warning("%s: failed to write samples: %s", self.name, err)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Note the time of the latest sample and persist it at most once per delay."""
+
+        self._restored = None
+        self._sample_time = dt_util.utcnow().timestamp()
+        self._store.async_throttled_save(self._stored_data)
+
+    @override
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and track the time it takes."""
+        start: Final = monotonic()
+        super().async_update_listeners()
+        self._latency.record("publish", monotonic() - start)
+
+    def _publish_period(self) -> float:
+        """Return the shortest time [s] between two published samples."""
+
+        return self._push_interval if self._push else self._min_interval
+
     def _device_stale(self) -> bool:
-        if self._link_q[-1]:
+        if self._link.last_success:
             self._stale = False
         elif (
             not self._stale
             and self.link_quality <= 10
-            and list(islice(reversed(self._link_q), 10)) == [False] * 10
+            and self._link.consecutive_failures >= 10
         ):
             rssi: Final = self.rssi
             LOGGER.error(
@@ -109,9 +530,169 @@ class BTBmsCoordinator(DataUpdateCoordinator[BMSSample]):
 
         return self._stale
 
+    def _adapt_interval(self, bms_data: BMSSample) -> None:
+        """Shorten polling interval on changing samples, back off on flat ones."""
+
+        if self._min_interval >= self._max_interval or self._sample_interval:
+            return
+        now: Final[float] = monotonic()
+        ref: Final = self._rate_ref
+        self._rate_ref = (now, bms_data)
+        if ref is None or (elapsed := now - ref[0]) <= 0:
+            return
+
+        new: Final = cast("dict[str, float]", bms_data)
+        old: Final = cast("dict[str, float]", ref[1])
+        changing: Final[bool] = any(
+            abs(new[key] - old[key]) >= threshold * elapsed
+            for key, threshold in ADAPTIVE_THRESHOLDS.items()
+            if key in new and key in old
+        )
+        self._interval = min(
+            max(
+                self._interval * (ADAPTIVE_SPEEDUP if changing else ADAPTIVE_BACKOFF),
+                self._min_interval,
+            ),
+            self._max_interval,
+        )
+        LOGGER.debug("%s: polling interval %.1fs", self.name, self._interval)
+
+    def _exceeds_deadband(self, new: object, old: object, band: float = 0) -> bool:
+        """Return whether a (nested) value changed by more than its deadband."""
+
+        if isinstance(new, dict) and isinstance(old, dict):
+            return new.keys() != old.keys() or any(
+                self._exceeds_deadband(value, old[key], self._deadbands.get(key, 0))
+                for key, value in new.items()
+                if key not in DEADBAND_DERIVED
+            )
+        if isinstance(new, list) and isinstance(old, list):
+            return len(new) != len(old) or any(
+                self._exceeds_deadband(value, prev, band)
+                for value, prev in zip(new, old, strict=True)
+            )
+        if band and isinstance(new, int | float) and isinstance(old, int | float):
+            return abs(new - old) > band
+        return new != old
+
+    def _apply_deadband(self, bms_data: BMSSample) -> BMSSample:
+        """Return the current data if the sample only changed within the deadbands."""
+
+        if (
+            not self._deadbands
+            or self.data is None
+            or self._exceeds_deadband(bms_data, self.data)
+        ):
+            return bms_data
+        LOGGER.debug("%s: sample change within deadband", self.name)
+        return self.data
+
+    def _backoff_delay(self) -> float | None:
+        """Return a randomized, exponentially growing delay after repeated failures."""
+
+        failures: Final[int] = self._failures
+        if failures < 2:  # retry a single failure within the regular interval
+            self._backoff = None
+            return None
+        delay: Final[float] = min(
+            self._interval * 2 ** min(failures - 1, 16),
+            max(BACKOFF_MAX, self._interval),
+        )
+        self._backoff = delay * (1 - BACKOFF_JITTER * random())
+        LOGGER.debug(
+            "%s: %i failures, backoff %.1fs", self.name, failures, self._backoff
+        )
+        return self._backoff
+
+    async def _async_wait_backoff(self, default: float) -> None:
+        """Wait for the backoff delay or until the device advertises again."""
+
+        self._seen.clear()
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(self._backoff_delay() or default):
+                await self._seen.wait()
+
+    @callback
+    def _async_device_seen(
+        self, _service_info: BluetoothServiceInfoBleak, _change: BluetoothChange
+    ) -> None:
+        """End the backoff as soon as the device advertises again.
+
+        Advertisements of a device that kept advertising do not help a failing
+        connection, so only a device that was unavailable ends the backoff.
+        """
+
+        unseen: Final[bool] = self._unseen
+        self._unseen = False
+        if self._backoff is None or not unseen:
+            return
+        LOGGER.debug("%s: device seen again, ending backoff", self.name)
+        self._backoff = None
+        self._seen.set()
+        if self.update_interval is not None:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_device_unseen(self, _service_info: BluetoothServiceInfoBleak) -> None:
+        """Note that the device stopped advertising."""
+        LOGGER.debug("%s: device unavailable", self.name)
+        self._unseen = True
+
+    def _next_interval(self) -> timedelta | None:
+        """Return the time until the next update, shifted once by the phase offset."""
+
+        if self._push:
+            return None
+        if (backoff := self._backoff_delay()) is not None:
+            return timedelta(seconds=backoff)
+        if self._phased:
+            return timedelta(seconds=self._interval)
+        self._phased = True
+        return timedelta(seconds=self._interval) + self.phase
+
     @override
     async def _async_setup(self) -> None:
-        bms_info: Final = await self._device.device_info()
+        # a failed setup is repeated by async_start
+        if self._unsub_adv is None:
+            self._unsub_adv = async_register_callback(
+                self.hass,
+                self._async_device_seen,
+                BluetoothCallbackMatcher(address=self._mac, connectable=True),
+                BluetoothScanningMode.ACTIVE,
+            )
+            assert self.config_entry is not None
+            self.config_entry.async_on_unload(
+                async_track_unavailable(
+                    self.hass, self._async_device_unseen, self._mac, connectable=True
+                )
+            )
+            if self._archive is not None or self._exporter is not None:
+                # batches are written at most a fifth of their maximum age late
+                self.config_entry.async_on_unload(
+                    async_track_time_interval(
+                        self.hass,
+                        self._async_flush,
+                        timedelta(seconds=BatchWriter.BATCH_AGE / 5),
+                    )
+                )
+        if self._info is None:
+            self._info_time = 0  # read again with the next update if this fails
+            await self._async_read_info()
+        else:
+            LOGGER.debug("%s: using stored device information", self.name)
+            self._apply_info(self._info)
+
+    async def _async_read_info(self) -> None:
+        """Read the device information via Bluetooth and keep it in the store."""
+
+        async with self._query_lock, self._scheduler.slot(self.source, self._mac):
+            bms_info: Final = await self._device.device_info()
+        self._info = bms_info
+        self._info_time = dt_util.utcnow().timestamp()
+        self._apply_info(bms_info)
+        self._store.async_delay_save(self._stored_data, STORE_DELAY)
+
+    def _apply_info(self, bms_info: BMSInfo) -> None:
         self.device_info.update(
             DeviceInfo(
                 name=bms_info.get("name") or self.name,
@@ -125,27 +706,300 @@ class BTBmsCoordinator(DataUpdateCoordinator[BMSSample]):
             )
         )
 
+    @callback
+    def _async_update_device_registry(self) -> None:
+        """Update the device registry with device information read after setup."""
+        assert self.config_entry is not None
+        dr.async_get(self.hass).async_get_or_create(
+            config_entry_id=self.config_entry.entry_id, **self.device_info
+        )
+
+    def _info_due(self) -> bool:
+        """Return whether the stored device information should be read again."""
+        return (
+            self._info_time is not None
+            and "info" not in self._tasks
+            and dt_util.utcnow().timestamp() - self._info_time > INFO_MAX_AGE
+        )
+
+    async def _async_refresh_info(self) -> None:
+        """Read the device information again without delaying data updates."""
+
+        try:
+            await self._async_read_info()
+        except (BleakError, EOFError, TimeoutError) as err:
+            LOGGER.debug("%s: failed to refresh device information: %s", self.name, err)
+            self._info_time = dt_util.utcnow().timestamp() - INFO_MAX_AGE + INFO_RETRY
+        else:
+            self._async_update_device_registry()
+        finally:
+            self._tasks.pop("info", None)
+
     @override
     async def _async_update_data(self) -> BMSSample:
         """Return the latest data from the device."""
 
         LOGGER.debug("%s: BMS data update", self.name)
 
-        if self._device_stale():
-            await self._device.disconnect(reset=True)
+        bms_data: BMSSample
+        updating: Final = asyncio.Event()
+        self._updating = updating
+        try:
+            if self._aggregator:
+                # the oversampled samples are recorded already
+                bms_data, self._extremes = self._aggregator.pop()
+            else:
+                bms_data = await self._async_sample()
+                self._extremes = {}
+                self._async_record(bms_data)
+        finally:
+            self.update_interval = self._next_interval()
+            self._updating = None
+            updating.set()
+            # the loops retry on their own, also if the first update failed
+            if self._push and "push" not in self._tasks:
+                self._tasks["push"] = self.hass.async_create_background_task(
+                    self._async_push(), f"{DOMAIN} push {self.name}"
+                )
+            if self._sample_interval and "oversample" not in self._tasks:
+                self._tasks["oversample"] = self.hass.async_create_background_task(
+                    self._async_oversample(self._sample_interval),
+                    f"{DOMAIN} oversample {self.name}",
+                )
+
+        if self._info_due():
+            self._tasks["info"] = self.hass.async_create_background_task(
+                self._async_refresh_info(), f"{DOMAIN} device info {self.name}"
+            )
+
+        self._async_send(bms_data)
+        return self._apply_deadband(bms_data)
+
+    async def _async_push(self) -> None:
+        """Continuously query the connected device and publish at a limited rate."""
+
+        LOGGER.debug("%s: starting push mode", self.name)
+        while True:
+            start: float = monotonic()
+            try:
+                bms_data: BMSSample = await self._async_sample()
+            except UpdateFailed as err:
+                LOGGER.debug("%s: push update failed: %s", self.name, err)
+                self.async_set_update_error(err)
+                await self._async_wait_backoff(self._interval)
+                continue
+            except Exception as err:  # noqa: BLE001
+                # without polling, an error of the BMS plugin must not end push mode
+                LOGGER.exception("%s: unexpected error in push mode", self.name)
+                self.async_set_update_error(err)
+                await self._async_wait_backoff(self._interval)
+                continue
+
+            self._async_publish(bms_data)
+            await asyncio.sleep(max(start + self._push_interval - monotonic(), 0))
+
+    @callback
+    def async_start_burst(self, duration: timedelta) -> None:
+        """Capture every sample for the given time, querying as fast as possible."""
+
+        LOGGER.debug("%s: starting burst for %s", self.name, duration)
+        self._burst.start(duration)
+        # push mode already provides every sample the device sends
+        if self._push or "burst" in self._tasks:
+            return
+        self._tasks["burst"] = self.hass.async_create_background_task(
+            self._async_burst(), f"{DOMAIN} burst {self.name}"
+        )
+
+    async def _async_burst(self) -> None:
+        """Query the device at the fastest rate until the burst ends."""
+
+        try:
+            while self._burst.active:
+                start: float = monotonic()
+                try:
+                    await self._async_sample(burst=True)
+                except UpdateFailed as err:
+                    # the backoff of the regular updates is left untouched
+                    LOGGER.debug("%s: burst sample failed: %s", self.name, err)
+                except Exception:  # noqa: BLE001
+                    LOGGER.exception("%s: unexpected error in burst", self.name)
+                await asyncio.sleep(max(start + BURST_INTERVAL - monotonic(), 0))
+        finally:
+            self._tasks.pop("burst", None)
+        LOGGER.debug("%s: burst captured %i samples", self.name, len(self._burst))
+
+    async def _async_oversample(self, interval: float) -> None:
+        """Query the device in short intervals and aggregate the samples."""
+
+        LOGGER.debug("%s: starting oversampling every %.1fs", self.name, interval)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                bms_data: BMSSample = await self._async_sample()
+            except UpdateFailed as err:
+                # unavailable data is reported, if no sample is left at update
+                LOGGER.debug("%s: oversampling failed: %s", self.name, err)
+                await self._async_wait_backoff(0)
+                continue
+            except Exception:  # noqa: BLE001
+                # an error of the BMS plugin must not end oversampling for good
+                LOGGER.exception("%s: unexpected error in oversampling", self.name)
+                await self._async_wait_backoff(0)
+                continue
+            # files and history keep every sample, entities show the aggregate
+            self._async_record(bms_data)
+            self._aggregator.add(bms_data)
+
+    @callback
+    def _async_publish(self, bms_data: BMSSample) -> None:
+        """Publish a sample received outside of the polling schedule if it changed."""
+        self._async_record(bms_data)
+        self._async_send(bms_data)
+        bms_data = self._apply_deadband(bms_data)
+        if not self.last_update_success or bms_data != self.data:
+            self.async_set_updated_data(bms_data)
+
+    async def _async_sample(self, burst: bool = False) -> BMSSample:
+        """Query a sample from the device and count failures by their reason.
+
+        Samples of a burst do not change the polling interval or connection policy.
+        """
+
+        try:
+            bms_data: Final = await self._async_query(burst)
+        except Exception as err:
+            if isinstance(err, UpdateFailed):
+                self._link.count_failure(err.translation_key or type(err).__name__)
+            # a cancelled query is repeated on a new connection, not backed off
+            if not burst and not isinstance(err, _BudgetExpired):
+                self._failures += 1
+            raise
+        if not burst:
+            self._failures = 0
+        return bms_data
+
+    async def _async_query(self, burst: bool) -> BMSSample:
+        """Query a sample from the device while holding a connection slot.
+
+        Polling, push, oversampling and burst share the device, so only one
+        of them queries it at a time.
+        """
+
+        async with self._query_lock:
+            await self._async_select_source()
+            if self._device_stale():
+                reset: Final = monotonic()
+                await self._device.disconnect(reset=True)
+                self._latency.record("reset", monotonic() - reset)
+                if self._info_time is not None:
+                    self._info_time = 0  # device may have been replaced or updated
+
+            queued: Final = monotonic()
+            async with self._scheduler.slot(self.source, self._mac):
+                self._latency.record("queue", monotonic() - queued)
+                bms_data: Final = await self._async_fetch(burst)
+                if self._adaptive_keep and not burst:
+                    await self._async_tune_connection(bms_data)
+                return bms_data
+
+    async def _async_select_source(self) -> None:
+        """Switch to the best connectable source if the current one fails or vanished."""
+
+        if self._bms_factory is None or not (
+            devices := async_scanner_devices_by_address(
+                self.hass, self._mac, connectable=True
+            )
+        ):
+            return
+
+        current: Final[str] = self.source
+        healthy: Final = [
+            dev
+            for dev in devices
+            if dev.scanner.source not in self._sources
+            or self._sources[dev.scanner.source].consecutive_failures < FAILOVER_ERRORS
+        ]
+        best: Final = max(healthy or devices, key=lambda dev: dev.advertisement.rssi)
+        if best.scanner.source == current:
+            return
+        if (
+            cur := next((dev for dev in healthy if dev.scanner.source == current), None)
+        ) is not None and (
+            # a kept connection is only moved away from a failing source
+            self._keep_alive
+            or best.advertisement.rssi < cur.advertisement.rssi + SOURCE_HYSTERESIS
+        ):
+            return
+
+        LOGGER.debug(
+            "%s: switching source from %s to %s (%i dBm)",
+            self.name,
+            current,
+            best.scanner.source,
+            best.advertisement.rssi,
+        )
+        await self._device.disconnect()
+        self._device = self._bms_factory(best.ble_device)
+        self._device_source = best.scanner.source
+        self._released = True
+
+    async def _async_tune_connection(self, bms_data: BMSSample) -> None:
+        """Keep the connection while the battery is active or reconnects are costly."""
+
+        if (latency := self._latency.last("update")) is not None:
+            if self._released:
+                self._fresh_latency = ewma(self._fresh_latency, latency)
+            else:
+                self._kept_latency = ewma(self._kept_latency, latency)
+
+        cost: Final = self.connect_cost
+        keep: Final[bool] = abs(bms_data.get("current", 0)) >= KEEP_ALIVE_CURRENT or (
+            not self._scheduler.waiting(self.source)
+            and (
+                cost is None  # measure update on kept connection first
+                or cost > KEEP_ALIVE_COST * (self._sample_interval or self._interval)
+            )
+        )
+        if not keep:
+            LOGGER.debug(
+                "%s: releasing connection (connect cost %s s)", self.name, cost
+            )
+            await self._device.disconnect()
+        self._released = not keep
+
+    async def _async_fetch(self, burst: bool) -> BMSSample:
+        """Query the device while holding a connection slot."""
 
         start: Final = monotonic()
+        source: Final = self._sources.setdefault(self.source, LinkStats())
+        # only queries on a kept connection are limited by the learned budget
+        connected: Final[bool] = self._device.is_connected
+        budget: Final = asyncio.timeout(self.timeout if connected else None)
+        bms_data: BMSSample = {}
         try:
-            if not (bms_data := await self._device.async_update()):
+            async with budget:
+                bms_data = await self._device.async_update()
+            if not bms_data:
+                source.record(False)
                 raise UpdateFailed(
                     translation_domain=DOMAIN,
                     translation_key="bms_no_valid_data",
                 )
         except TimeoutError as err:
+            source.record(False)
+            if budget.expired():
+                # the cancelled update may have left the connection in any state
+                await self._device.disconnect(reset=True)
+                self._released = True
+                raise _BudgetExpired(
+                    translation_domain=DOMAIN, translation_key="bms_timeout"
+                ) from err
             raise UpdateFailed(
                 translation_domain=DOMAIN, translation_key="bms_timeout"
             ) from err
         except (BleakError, EOFError) as err:
+            source.record(False)
             rssi: Final = self.rssi
             raise UpdateFailed(
                 translation_domain=DOMAIN,
@@ -158,11 +1012,18 @@ class BTBmsCoordinator(DataUpdateCoordinator[BMSSample]):
                 },
             ) from err
         finally:
-            self._link_q.extend(
-                [False] * (1 + int((monotonic() - start) / UPDATE_INTERVAL))
+            elapsed: Final = monotonic() - start
+            self._link.record(
+                bool(bms_data), elapsed, missed=int(elapsed / self._interval)
             )
 
-        self._link_q[-1] = True  # set success
+        self._latency.record("update", elapsed)
+        if connected:
+            self._kept_updates.append(elapsed)
+        source.record(True, elapsed)
         LOGGER.debug("%s: BMS data sample %s", self.name, bms_data)
+        self._burst.add(bms_data)
+        if not burst:
+            self._adapt_interval(bms_data)
 
         return bms_data
@@ -1,6 +1,6 @@
 """Provide diagnostics data for a battery management system."""
 
-from typing import Any, Final
+from typing import Any, Final, cast
 
 from homeassistant.components.bluetooth import async_last_service_info
 from homeassistant.components.bluetooth.const import DOMAIN as BT_DOMAIN
@@ -10,7 +10,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 
 from . import BTBmsConfigEntry
+from .bank import BTBankCoordinator, is_bank
 from .coordinator import BTBmsCoordinator
+from .scheduler import SlotScheduler, async_get_scheduler
 
 TO_REDACT: frozenset[str] = frozenset(
     {ATTR_AREA_ID, ATTR_ID, ATTR_SERIAL_NUMBER, CONF_PASSWORD, "entry_id"}
@@ -22,9 +24,22 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
 
+    if is_bank(entry):
+        bank: Final = cast("BTBankCoordinator", entry.runtime_data)
+        return {
+            "config_entry": async_redact_data(entry.as_dict(), TO_REDACT),
+            "bank_data": bank.data,
+            "members": {
+                member.name: member.last_update_success
+                for member in bank.members.values()
+            },
+        }
+
     adapter_info: str = "unavailable"
     coord: Final[BTBmsCoordinator] = entry.runtime_data
     mac: str = str(entry.unique_id)
+    scheduler: Final[SlotScheduler] = async_get_scheduler(hass)
+    source: Final[str] = coord.source
 
     if (adv_data := async_last_service_info(hass, address=mac, connectable=True)) and (
         adapter := dr.async_get(hass).async_get_device(
@@ -43,11 +58,36 @@ async def async_get_config_entry_diagnostics(
             adv_data.as_dict() if adv_data else {}, TO_REDACT | {"source"}
         ),
         "bms_link_quality": coord.link_quality,
+        "bms_link_statistics": coord.link_stats.as_dict(),
+        "bms_latency": coord.latency.as_dict(),
+        "bms_sources": [  # source addresses are redacted
+            {"active": src == source} | stats.as_dict()
+            for src, stats in coord.source_stats.items()
+        ],
+        "connection_slots": {
+            "total": scheduler.slots(source),
+            "active": scheduler.active(source),
+            "waiting": scheduler.waiting(source),
+        },
         "bms_info": async_redact_data(coord.device_info, TO_REDACT),
         "bms_data": coord.data,
+        "bms_burst": coord.burst.as_list(),
+        "bms_history": {
+            "samples": len(coord.history),
+            "capacity": coord.history.capacity,
+            "cells": coord.history.cell_count,
+            "bytes": coord.history.nbytes,
+        },
         "update_data": {
             "last_update_success": coord.last_update_success,
             "last_exception": coord.last_exception,
             "interval": coord.update_interval,
+            "interval_range": coord.interval_range,
+            "backoff": coord.backoff,
+            "phase": coord.phase,
+            "push_mode": coord.push_mode,
+            "adaptive_keep_alive": coord.adaptive_keep_alive,
+            "connect_cost": coord.connect_cost,
+            "timeout": coord.timeout,
         },
     }
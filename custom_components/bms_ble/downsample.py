@@ -0,0 +1,69 @@
+"""Downsampling of time series for BLE Battery Management System integration."""
+
+from array import array
+from collections.abc import Sequence
+from math import fsum
+from typing import Final
+
+
+def lttb(
+    times: Sequence[float], values: Sequence[float], points: int
+) -> tuple[array[float], array[float]]:
+    """Return at most the given number of points by largest-triangle-three-buckets.
+
+    Keeps the first and the last point, picks the point of each bucket in between
+    that forms the largest triangle with the previous pick and the next bucket mean.
+    """
+
+    count: Final[int] = len(values)
+    if count <= points or points < 3:
+        return array("d", times), array("d", values)
+    step: Final[float] = (count - 2) / (points - 2)
+    out_times: Final = array("d", [times[0]])
+    out_values: Final = array("d", [values[0]])
+    prev: int = 0
+    for bucket in range(points - 2):
+        start: int = int(bucket * step) + 1
+        end: int = int((bucket + 1) * step) + 1
+        next_end: int = min(int((bucket + 2) * step) + 1, count)
+        mean_time: float = fsum(times[end:next_end]) / (next_end - end)
+        mean_value: float = fsum(values[end:next_end]) / (next_end - end)
+        # twice the triangle area is linear in the time and value of the candidate
+        d_time: float = times[prev] - mean_time
+        d_value: float = mean_value - values[prev]
+        offset: float = -times[prev] * d_value - values[prev] * d_time
+        prev = max(
+            range(start, end),
+            key=lambda idx: abs(d_time * values[idx] + d_value * times[idx] + offset),
+        )
+        out_times.append(times[prev])
+        out_values.append(values[prev])
+    out_times.append(times[-1])
+    out_values.append(values[-1])
+    return out_times, out_values
+
+
+def min_max(
+    times: Sequence[float], values: Sequence[float], points: int
+) -> tuple[array[float], array[float]]:
+    """Return at most the given number of points by the extremes of equal buckets.
+
+    Each bucket contributes its minimum and its maximum in the order they occurred,
+    so that peaks are preserved.
+    """
+
+    count: Final[int] = len(values)
+    if count <= points or points < 2:
+        return array("d", times), array("d", values)
+    buckets: Final[int] = points // 2
+    out_times: Final = array("d")
+    out_values: Final = array("d")
+    for bucket in range(buckets):
+        start: int = bucket * count // buckets
+        chunk: Sequence[float] = values[start : (bucket + 1) * count // buckets]
+        low: int = start + chunk.index(min(chunk))
+        high: int = start + chunk.index(max(chunk))
+        for idx in sorted({low, high}):
+            out_times.append(times[idx])
+            out_values.append(values[idx])
+    return out_times, out_values
@@ -0,0 +1,127 @@
+"""Export of samples to files for BLE Battery Management System integration."""
+
+import csv
+from datetime import UTC, datetime
+import io
+from itertools import groupby
+from math import isfinite
+from pathlib import Path
+from time import time
+from typing import Final, override
+
+from aiobmsble import BMSSample
+
+from .writer import BatchWriter
+
+EXPORT_FORMATS: Final[tuple[str, ...]] = ("csv", "line_protocol")
+MEASUREMENT: Final[str] = "bms_ble"  # line protocol measurement name
+# list fields of a sample exported as numbered fields
+LIST_FIELDS: Final[dict[str, str]] = {
+    "cell_voltages": "cell_voltage",
+    "temp_values": "temp_value",
+}
+
+
+def flatten(sample: BMSSample) -> dict[str, float]:
+    """Return the numeric values of a sample, list fields with their index."""
+
+    values: Final[dict[str, float]] = {}
+    for key, value in sample.items():
+        if key in LIST_FIELDS and isinstance(value, list):
+            values.update(
+                {f"{LIST_FIELDS[key]}_{idx}": val for idx, val in enumerate(value)}
+            )
+        elif isinstance(value, int | float):  # includes bool
+            values[key] = value
+    return values
+
+
+class SampleExporter(BatchWriter[tuple[float, BMSSample]]):
+    """Daily files with all samples of one BMS as CSV or InfluxDB line protocol."""
+
+    __slots__ = ("_columns", "_format", "_name", "_path")
+
+    def __init__(self, path: Path, name: str, fmt: str) -> None:
+        """Initialize the export of a BMS with a file name prefix to a directory."""
+
+        super().__init__()
+        self._path: Final[Path] = path
+        self._name: Final[str] = name
+        self._format: Final[str] = fmt
+        self._columns: tuple[Path, list[str]] | None = None  # CSV header of a file
+
+    @override
+    def add(self, sample: BMSSample, now: float | None = None) -> None:
+        """Add a sample taken at the given POSIX time, default is now."""
+        self._append((time() if now is None else now, sample))
+
+    @override
+    def _write(self, records: list[tuple[float, BMSSample]]) -> None:
+        """Append the records to the files of the days they were taken."""
+
+        self._path.mkdir(parents=True, exist_ok=True)
+        for day, group in groupby(
+            records, key=lambda record: datetime.fromtimestamp(record[0], UTC).date()
+        ):
+            rows: list[tuple[float, dict[str, float]]] = [
+                (stamp, flatten(sample)) for stamp, sample in group
+            ]
+            if self._format == "csv":
+                self._write_csv(self._path / f"{self._name}_{day}.csv", rows)
+            else:
+                self._write_lines(self._path / f"{self._name}_{day}.txt", rows)
+
+    def _write_csv(
+        self, path: Path, rows: list[tuple[float, dict[str, float]]]
+    ) -> None:
+        """Append rows to a CSV file, the columns are set by the first rows of a day."""
+
+        new: Final[bool] = not path.is_file() or not path.stat().st_size
+        if self._columns is None or self._columns[0] != path:
+            if new:
+                columns: list[str] = [
+                    "timestamp",
+                    *dict.fromkeys(key for _stamp, row in rows for key in row),
+                ]
+            else:
+                with path.open(newline="") as file:
+                    columns = next(csv.reader(file))
+            self._columns = (path, columns)
+        buffer: Final = io.StringIO()
+        writer: Final = csv.DictWriter(
+            buffer, self._columns[1], extrasaction="ignore", lineterminator="\n"
+        )
+        if new:
+            writer.writeheader()
+        writer.writerows(
+            {"timestamp": datetime.fromtimestamp(stamp, UTC).isoformat()} | row
+            for stamp, row in rows
+        )
+        with path.open("a", newline="") as file:
+            file.write(buffer.getvalue())
+
+    def _write_lines(
+        self, path: Path, rows: list[tuple[float, dict[str, float]]]
+    ) -> None:
+        """Append rows to a file in InfluxDB line protocol."""
+
+        tags: Final[str] = f"{MEASUREMENT},device=" + self._name.translate(
+            {ord(char): f"\\{char}" for char in ", ="}
+        )
+        with path.open("a") as file:
+            file.write(
+                "".join(
+                    f"{tags} {_line_fields(row)} {round(stamp * 1e9)}\n"
+                    for stamp, row in rows
+                    if row
+                )
+            )
+
+
+def _line_fields(row: dict[str, float]) -> str:
+    """Return the finite fields of a row in line protocol, numbers as float."""
+    return ",".join(
+        f"{key}={str(value).lower() if isinstance(value, bool) else float(value)}"
+        for key, value in row.items()
+        if isfinite(value)
+    )
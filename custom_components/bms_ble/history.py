@@ -0,0 +1,154 @@
+"""Sample history for BLE Battery Management System integration."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from math import ceil, inf, isnan, nan
+from time import time
+from typing import Final, Self, cast
+
+from aiobmsble import BMSSample
+
+
+class SampleHistory:
+    """Ring buffer of recent samples in typed arrays with fixed memory size."""
+
+    # numeric fields kept per sample, cell voltages are kept separately
+    FIELDS: Final[tuple[str, ...]] = (
+        "voltage",
+        "current",
+        "power",
+        "battery_level",
+        "battery_health",
+        "cycle_charge",
+        "cycle_capacity",
+        "delta_voltage",
+        "temperature",
+        "balance_current",
+        "runtime",
+    )
+    MAX_CELLS: Final[int] = 32  # cell voltages kept per sample
+    MAX_SAMPLES: Final[int] = 8640  # 24h at 10s, about 450 kB without cell voltages
+
+    __slots__ = ("_capacity", "_cells", "_len", "_max_age", "_pos", "_time", "_values")
+
+    def __init__(self, capacity: int, max_age: float) -> None:
+        """Initialize an empty history for a number of samples up to an age [s]."""
+
+        self._capacity: Final[int] = capacity
+        self._max_age: Final[float] = max_age
+        self._time: Final = array("d", bytes(8 * capacity))  # POSIX timestamps
+        self._values: Final[dict[str, array[float]]] = {
+            key: array("f", [nan]) * capacity for key in self.FIELDS
+        }
+        self._cells: list[array[float]] = []  # allocated with the first cell data
+        self._pos: int = 0  # position of the next sample in the ring
+        self._len: int = 0  # number of valid samples in the ring
+
+    @classmethod
+    def for_span(cls, max_age: float, interval: float) -> Self:
+        """Return a history for samples up to an age [s] taken every interval [s]."""
+        return cls(min(ceil(max_age / interval), cls.MAX_SAMPLES), max_age)
+
+    def __len__(self) -> int:
+        """Return the number of samples within the maximum age."""
+        self._evict(time())
+        return self._len
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples."""
+        return self._capacity
+
+    @property
+    def cell_count(self) -> int:
+        """Return the number of cells kept per sample."""
+        return len(self._cells)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory [bytes] used by the sample data."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._time, *self._values.values(), *self._cells)
+        )
+
+    def _start(self) -> int:
+        """Return the position of the oldest sample."""
+        return (self._pos - self._len) % self._capacity if self._capacity else 0
+
+    def _evict(self, now: float) -> None:
+        """Drop samples exceeding the maximum age from the start of the ring."""
+
+        start: int = self._start()
+        while self._len and self._time[start] < now - self._max_age:
+            start = (start + 1) % self._capacity
+            self._len -= 1
+
+    def add(self, sample: BMSSample, now: float | None = None) -> None:
+        """Add a sample taken at the given POSIX time, default is now."""
+
+        if not self._capacity:
+            return
+        now = time() if now is None else now
+        values: Final = cast("dict[str, float]", sample)
+        for key, column in self._values.items():
+            column[self._pos] = nan if (value := values.get(key)) is None else value
+        cells: Final[list[float]] = sample.get("cell_voltages", [])
+        if cells and not self._cells:
+            self._cells = [
+                array("f", [nan]) * self._capacity
+                for _ in range(min(len(cells), self.MAX_CELLS))
+            ]
+        for idx, column in enumerate(self._cells):
+            column[self._pos] = cells[idx] if idx < len(cells) else nan
+        self._time[self._pos] = now
+        self._pos = (self._pos + 1) % self._capacity
+        self._len = min(self._len + 1, self._capacity)
+        self._evict(now)
+
+    def _ordered(self, column: array[float]) -> array[float]:
+        """Return the valid entries of a column from oldest to latest."""
+
+        start: Final[int] = self._start()
+        if start + self._len <= self._capacity:
+            return column[start : start + self._len]
+        return column[start:] + column[: self._pos]
+
+    def timestamps(self) -> array[float]:
+        """Return the POSIX timestamps of the samples from oldest to latest."""
+        self._evict(time())
+        return self._ordered(self._time)
+
+    def field(self, key: str) -> array[float]:
+        """Return the values of a field, NaN if a sample did not contain it."""
+        self._evict(time())
+        return self._ordered(self._values[key])
+
+    def cell(self, idx: int) -> array[float]:
+        """Return the voltages of a cell, NaN if a sample did not contain it."""
+        self._evict(time())
+        return self._ordered(self._cells[idx])
+
+    def series(
+        self, column: str | int, start: float = 0, end: float = inf
+    ) -> tuple[array[float], array[float]]:
+        """Return timestamps and values of a field or cell within a time range.
+
+        Samples that did not contain the value are left out.
+        """
+
+        times: array[float] = self.timestamps()
+        if isinstance(column, str):
+            values: array[float] = self.field(column)
+        elif column < len(self._cells):
+            values = self.cell(column)
+        else:
+            return array("d"), array("f")
+        first: Final[int] = bisect_left(times, start)
+        last: Final[int] = bisect_right(times, end)
+        times, values = times[first:last], values[first:last]
+        valid: Final[list[bool]] = [not isnan(value) for value in values]
+        if all(valid):
+            return times, values
+        return array("d", compress(times, valid)), array("f", compress(values, valid))
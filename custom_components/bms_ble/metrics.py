@@ -0,0 +1,170 @@
+"""Prometheus metrics of the BLE Battery Management System integration."""
+
+from math import isfinite
+from typing import Final, cast
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import format_mac
+
+from .bank import is_bank
+from .const import DOMAIN
+from .coordinator import BTBmsCoordinator
+from .export import LIST_FIELDS
+from .stats import LatencyStats
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+# type and help of the metric families besides the sample fields
+FAMILIES: Final[dict[str, tuple[str, str]]] = {
+    "up": ("gauge", "Whether the latest update of the BMS succeeded"),
+    "link_quality": ("gauge", "Percentage of successful recent update attempts"),
+    "rssi": ("gauge", "Signal strength of the BMS in dBm"),
+    "update_duration_seconds": ("histogram", "Duration of the BMS update phases"),
+    "update_failures_total": ("counter", "Failed BMS updates by reason"),
+    "source_attempts_total": ("counter", "Update attempts per Bluetooth source"),
+    "source_successes_total": ("counter", "Successful updates per Bluetooth source"),
+}
+
+
+def _escape(value: str) -> str:
+    """Return a label value escaped for the text exposition format."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(**labels: str) -> str:
+    """Return a label set in the text exposition format."""
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _header(family: str) -> str:
+    """Return the help and type lines of a metric family."""
+
+    kind, text = FAMILIES.get(family, ("gauge", f"Latest {family} of the BMS"))
+    return f"# HELP {DOMAIN}_{family} {text}\n# TYPE {DOMAIN}_{family} {kind}\n"
+
+
+def _sample(family: str, labels: str, value: float, suffix: str = "") -> str:
+    """Return a sample line in the text exposition format."""
+    return f"{DOMAIN}_{family}{suffix}{{{labels}}} {float(value)!r}\n"
+
+
+def _device(name: str, address: str) -> str:
+    """Return the labels identifying a BMS, as names need not be unique."""
+    return _labels(name=name, address=address)
+
+
+def render(coordinator: BTBmsCoordinator, name: str, address: str) -> dict[str, str]:
+    """Return the sample lines of a BMS per metric family.
+
+    The signal strength is left out, as it changes with every advertisement.
+    """
+
+    device: Final[str] = _device(name, address)
+    lines: Final[dict[str, list[str]]] = {}
+
+    def add(family: str, value: float, labels: str = "", suffix: str = "") -> None:
+        if isfinite(value):
+            lines.setdefault(family, []).append(
+                _sample(family, device + labels, value, suffix)
+            )
+
+    add("up", coordinator.last_update_success)
+    add("link_quality", coordinator.link_quality)
+    for key, value in (coordinator.data or {}).items():
+        if key in LIST_FIELDS and isinstance(value, list):
+            for idx, val in enumerate(value):
+                add(LIST_FIELDS[key], val, f",{_labels(index=str(idx))}")
+        elif isinstance(value, int | float):  # includes bool
+            add(key, value)
+    for phase in LatencyStats.PHASES:
+        counts, total = coordinator.latency.histogram(phase)
+        phase_label: str = f",{_labels(phase=phase)}"
+        for bound, count in zip(
+            (*map(str, LatencyStats.BUCKETS), "+Inf"), counts, strict=True
+        ):
+            add(
+                "update_duration_seconds",
+                count,
+                f"{phase_label},{_labels(le=bound)}",
+                "_bucket",
+            )
+        add("update_duration_seconds", total, phase_label, "_sum")
+        add("update_duration_seconds", counts[-1], phase_label, "_count")
+    for reason, count in sorted(coordinator.link_stats.failures.items()):
+        add("update_failures_total", count, f",{_labels(reason=reason)}")
+    for source, stats in coordinator.source_stats.items():
+        add("source_attempts_total", stats.attempts, f",{_labels(source=source)}")
+        add("source_successes_total", stats.successes, f",{_labels(source=source)}")
+    return {family: "".join(samples) for family, samples in lines.items()}
+
+
+class MetricsView(HomeAssistantView):
+    """Latest samples and link statistics of all BMS in the text exposition format.
+
+    The lines of a BMS are cached and only rendered again after an update
+    attempt of that BMS, so a scrape only walks the devices that changed.
+    Only the signal strength, which changes with every advertisement, is
+    read at each scrape.
+    """
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view without cached lines."""
+        # entry ID: revision and lines per metric family
+        self._devices: Final[dict[str, tuple[tuple, dict[str, str]]]] = {}
+        self._text: str = ""
+
+    @callback
+    def async_render(self, hass: HomeAssistant) -> str:
+        """Return the metrics of all loaded BMS."""
+
+        changed: bool = False
+        rssi: str = ""
+        entries: Final = {
+            entry.entry_id: entry
+            for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+            if not is_bank(entry)
+        }
+        for entry_id in self._devices.keys() - entries.keys():
+            del self._devices[entry_id]
+            changed = True
+        for entry_id, entry in entries.items():
+            coordinator = cast("BTBmsCoordinator", entry.runtime_data)
+            # entries of a BMS are set up with its address as unique ID
+            address: str = format_mac(cast("str", entry.unique_id))
+            # publishes cover new samples, attempts cover link statistics
+            revision: tuple = (
+                coordinator.latency.total("publish"),
+                coordinator.link_stats.attempts,
+                entry.title,
+            )
+            if (cached := self._devices.get(entry_id)) is None or cached[0] != revision:
+                self._devices[entry_id] = (
+                    revision,
+                    render(coordinator, entry.title, address),
+                )
+                changed = True
+            if (value := coordinator.rssi) is not None:
+                rssi += _sample("rssi", _device(entry.title, address), value)
+        if changed:
+            families: dict[str, list[str]] = {}
+            for _revision, lines in self._devices.values():
+                for family, samples in lines.items():
+                    families.setdefault(family, []).append(samples)
+            # all samples of a family need to follow its header
+            self._text = "".join(
+                _header(family) + "".join(samples)
+                for family, samples in families.items()
+            )
+        return self._text + (_header("rssi") + rssi if rssi else "")
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics."""
+        return web.Response(
+            body=self.async_render(request.app[KEY_HASS]).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -0,0 +1,105 @@
+"""Bluetooth connection slot scheduler for BLE Battery Management System integration."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from time import monotonic
+from typing import Final
+
+from habluetooth import get_manager
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DEFAULT_SLOTS, DOMAIN, LOGGER, SLOT_RECHECK, SLOT_WAIT
+
+
+class SlotScheduler:
+    """Admit BMS updates per Bluetooth source so no more than the available slots are used.
+
+    Slots held by kept connections and by other integrations are taken into
+    account if the source reports its allocations.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._active: dict[str, list[str]] = {}  # addresses of running updates
+        self._waiters: dict[str, deque[asyncio.Event]] = {}
+
+    @staticmethod
+    def slots(source: str) -> int:
+        """Return the number of connection slots of a Bluetooth source."""
+
+        if allocations := get_manager().async_current_allocations(source):
+            return max(allocations[0].slots, 1)
+        return DEFAULT_SLOTS
+
+    def active(self, source: str) -> int:
+        """Return the number of updates currently running via a Bluetooth source."""
+        return len(self._active.get(source, ()))
+
+    def waiting(self, source: str) -> int:
+        """Return the number of updates queued for a Bluetooth source."""
+        return len(self._waiters.get(source, ()))
+
+    def _free(self, source: str, address: str) -> bool:
+        """Return whether an update of a device can connect via the source now."""
+
+        running: Final[list[str]] = self._active.get(source, [])
+        if not (allocations := get_manager().async_current_allocations(source)):
+            return len(running) < DEFAULT_SLOTS
+        allocated: Final[list[str]] = allocations[0].allocated
+        if address in allocated:
+            return True  # kept connection already holds its slot
+        # running updates that did not connect yet will take a slot
+        return allocations[0].free > sum(addr not in allocated for addr in running)
+
+    @asynccontextmanager
+    async def slot(self, source: str, address: str) -> AsyncIterator[None]:
+        """Wait in line for a free slot of the source and hold it for the update.
+
+        The first waiter checks again whenever an update ends and periodically
+        for slots released by others. After a maximum time, it tries anyway.
+        """
+
+        waiters: Final = self._waiters.setdefault(source, deque())
+        if waiters or not self._free(source, address):
+            ready: Final = asyncio.Event()
+            waiters.append(ready)
+            LOGGER.debug("%s: queued update, %i waiting", source, len(waiters))
+            deadline: Final[float] = monotonic() + SLOT_WAIT
+            try:
+                while monotonic() < deadline and (
+                    waiters[0] is not ready or not self._free(source, address)
+                ):
+                    ready.clear()
+                    with suppress(TimeoutError):
+                        async with asyncio.timeout(SLOT_RECHECK):
+                            await ready.wait()
+            finally:
+                waiters.remove(ready)
+                self._notify(source)
+
+        self._active.setdefault(source, []).append(address)
+        try:
+            yield
+        finally:
+            self._active[source].remove(address)
+            self._notify(source)
+
+    def _notify(self, source: str) -> None:
+        """Let the first waiter of the source check for a free slot."""
+        if waiters := self._waiters.get(source):
+            waiters[0].set()
+
+
+DATA_SCHEDULER: Final[HassKey[SlotScheduler]] = HassKey(DOMAIN)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> SlotScheduler:
+    """Return the integration-wide slot scheduler."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = SlotScheduler()
+    return scheduler
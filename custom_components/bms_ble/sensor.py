@@ -1,6 +1,7 @@
 """Platform for sensor integration."""
 
 from collections.abc import Callable
+from dataclasses import replace
 from typing import Final, cast, override
 
 from aiobmsble import BMSpackvalue, BMSSample, PackSample
@@ -32,6 +33,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import BTBmsConfigEntry
+from .bank import BTBankCoordinator, is_bank
 from .const import (
     ATTR_BALANCE_CUR,
     ATTR_BATTERY_HEALTH,
@@ -42,10 +44,16 @@ from .const import (
     ATTR_CYCLES,
     ATTR_DELTA_VOLTAGE,
     ATTR_DESIGN_CAP,
+    ATTR_LATENCY_PUBLISH,
+    ATTR_LATENCY_QUEUE,
+    ATTR_LATENCY_UPDATE,
     ATTR_LQ,
     ATTR_MAX_VOLTAGE,
+    ATTR_MAXIMUM,
     ATTR_MIN_VOLTAGE,
+    ATTR_MINIMUM,
     ATTR_POWER,
+    ATTR_RESTORED,
     ATTR_RSSI,
     ATTR_RUNTIME,
     ATTR_TEMP_SENSORS,
@@ -253,6 +261,36 @@ SENSOR_TYPES: Final[list[BmsEntityDescription]] = [
         translation_key=ATTR_LQ,
         value_fn=lambda data: None,
     ),
+    *(
+        BmsEntityDescription(
+            device_class=SensorDeviceClass.DURATION,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            key=key,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+            translation_key=key,
+            value_fn=lambda data: None,
+        )
+        for key in (ATTR_LATENCY_QUEUE, ATTR_LATENCY_UPDATE, ATTR_LATENCY_PUBLISH)
+    ),
+]
+
+
+# battery bank values, named and shown like the ones of a single battery
+BANK_SENSOR_TYPES: Final[list[BmsEntityDescription]] = [
+    replace(descr, attr_fn=None, entity_registry_enabled_default=True)
+    for descr in SENSOR_TYPES
+    if descr.key
+    in (
+        ATTR_BATTERY_LEVEL,
+        ATTR_CURRENT,
+        ATTR_CYCLE_CAP,
+        ATTR_MAX_VOLTAGE,
+        ATTR_MIN_VOLTAGE,
+        ATTR_POWER,
+    )
 ]
 
 
@@ -263,6 +301,14 @@ async def async_setup_entry(
 ) -> None:
     """Add sensors for passed config_entry in Home Assistant."""
 
+    if is_bank(config_entry):
+        bank: Final = cast("BTBankCoordinator", config_entry.runtime_data)
+        async_add_entities(
+            BankSensor(bank, descr, config_entry.entry_id)
+            for descr in BANK_SENSOR_TYPES
+        )
+        return
+
     bms: Final = config_entry.runtime_data
     mac: Final = format_mac(config_entry.unique_id)
     entities: list[SensorEntity] = []
@@ -273,6 +319,9 @@ async def async_setup_entry(
         if descr.key == ATTR_LQ:
             entities.append(LQSensor(bms, descr, mac))
             continue
+        if descr.key in (ATTR_LATENCY_QUEUE, ATTR_LATENCY_UPDATE, ATTR_LATENCY_PUBLISH):
+            entities.append(LatencySensor(bms, descr, mac))
+            continue
         if descr.optional and descr.key not in bms.data:
             continue
         entities.append(BMSSensor(bms, descr, mac))
@@ -298,12 +347,28 @@ class BMSSensor(CoordinatorEntity[BTBmsCoordinator], SensorEntity):
 
     @property
     @override
-    def extra_state_attributes(self) -> dict[str, list[int | float]] | None:
+    def available(self) -> bool:
+        """Return if entity is available, also while showing a restored sample."""
+        return super().available or self.coordinator.restored is not None
+
+    @property
+    @override
+    def extra_state_attributes(
+        self,
+    ) -> dict[str, list[int | float] | float | str] | None:
         """Return entity specific state attributes, e.g. cell voltages."""
+        attrs: dict[str, list[int | float] | float | str] | None = None
         if self.coordinator.data and self.entity_description.attr_fn:
-            return self.entity_description.attr_fn(self.coordinator.data)
+            attrs = dict(self.entity_description.attr_fn(self.coordinator.data))
+        if extremes := self.coordinator.extremes.get(self.entity_description.key):
+            attrs = (attrs or {}) | {
+                ATTR_MINIMUM: extremes[0],
+                ATTR_MAXIMUM: extremes[1],
+            }
+        if restored := self.coordinator.restored:
+            attrs = (attrs or {}) | {ATTR_RESTORED: restored.isoformat()}
 
-        return None
+        return attrs
 
     @property
     @override
@@ -316,6 +381,28 @@ class BMSSensor(CoordinatorEntity[BTBmsCoordinator], SensorEntity):
         )
 
 
+class BankSensor(CoordinatorEntity[BTBankCoordinator], SensorEntity):
+    """The battery bank sensor implementation."""
+
+    _attr_has_entity_name = True
+    entity_description: BmsEntityDescription
+
+    def __init__(
+        self, bank: BTBankCoordinator, descr: BmsEntityDescription, entry_id: str
+    ) -> None:
+        """Initialize the battery bank sensor."""
+        self._attr_unique_id = f"{DOMAIN}-{entry_id}-{descr.key}"
+        self._attr_device_info = bank.device_info
+        self.entity_description = descr
+        super().__init__(bank)
+
+    @property
+    @override
+    def native_value(self) -> float | None:
+        """Return the sensor value."""
+        return self.coordinator.data.get(self.entity_description.key)
+
+
 class RSSISensor(SensorEntity):
     """The Bluetooth RSSI sensor."""
 
@@ -368,3 +455,43 @@ class LQSensor(SensorEntity):
         self._attr_native_value = self._bms.link_quality
 
         LOGGER.debug("%s: Link quality: %i %%", self._bms.name, self._attr_native_value)
+
+
+class LatencySensor(SensorEntity):
+    """The BMS update latency sensor for a single phase of the update."""
+
+    _unrecorded_attributes: frozenset[str] = frozenset({MATCH_ALL})
+    _attr_has_entity_name = True
+    _attr_available = True  # always available
+
+    def __init__(
+        self, bms: BTBmsCoordinator, descr: SensorEntityDescription, unique_id: str
+    ) -> None:
+        """Initialize the BMS latency sensor."""
+
+        self._attr_unique_id = f"{DOMAIN}-{unique_id}-{descr.key}"
+        self._attr_device_info = bms.device_info
+        self.entity_description = descr
+        self._bms: Final = bms
+        self._phase: Final[str] = descr.key.removesuffix("_latency")
+
+    @staticmethod
+    def _ms(duration: float | None) -> float | None:
+        return round(duration * 1000, 1) if duration is not None else None
+
+    async def async_update(self) -> None:
+        """Update BMS latency sensor value and its percentiles."""
+
+        latency: Final = self._bms.latency
+        self._attr_native_value = self._ms(latency.last(self._phase))
+        self._attr_extra_state_attributes = {
+            "p50": self._ms(latency.percentile(self._phase, 50)),
+            "p95": self._ms(latency.percentile(self._phase, 95)),
+        }
+
+        LOGGER.debug(
+            "%s: %s latency: %s ms",
+            self._bms.name,
+            self._phase,
+            self._attr_native_value,
+        )
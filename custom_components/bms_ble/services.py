@@ -0,0 +1,93 @@
+"""Actions of the BLE Battery Management System integration."""
+
+from datetime import timedelta
+from typing import Final
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .bank import is_bank
+from .const import ATTR_DURATION, DOMAIN
+from .coordinator import BTBmsCoordinator
+
+SERVICE_START_BURST: Final[str] = "start_burst"
+SERVICE_GET_BURST: Final[str] = "get_burst"
+BURST_MAX_DURATION: Final[int] = 60  # [min]
+
+ENTRY_SCHEMA: Final = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+START_BURST_SCHEMA: Final = ENTRY_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_DURATION, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BURST_MAX_DURATION)
+        )
+    }
+)
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant, entry_id: str) -> BTBmsCoordinator:
+    """Return the coordinator of a loaded BMS config entry."""
+
+    if (
+        (entry := hass.config_entries.async_get_entry(entry_id)) is None
+        or entry.domain != DOMAIN
+        or is_bank(entry)
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_config_entry",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="config_entry_not_loaded",
+            translation_placeholders={"name": entry.title},
+        )
+    return entry.runtime_data
+
+
+@callback
+def _async_get_coordinator(call: ServiceCall) -> BTBmsCoordinator:
+    """Return the coordinator of the BMS config entry the action refers to."""
+    return async_get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+
+async def _async_start_burst(call: ServiceCall) -> None:
+    """Capture all samples of a BMS for a limited time."""
+    _async_get_coordinator(call).async_start_burst(
+        timedelta(minutes=call.data[ATTR_DURATION])
+    )
+
+
+async def _async_get_burst(call: ServiceCall) -> ServiceResponse:
+    """Return the samples captured by the latest burst of a BMS."""
+    burst: Final = _async_get_coordinator(call).burst
+    return {"active": burst.active, "samples": burst.as_list()}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the actions of the integration."""
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_BURST, _async_start_burst, schema=START_BURST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BURST,
+        _async_get_burst,
+        schema=ENTRY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
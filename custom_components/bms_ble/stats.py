@@ -0,0 +1,237 @@
+"""Link statistics for BLE Battery Management System integration."""
+
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Iterable
+from itertools import accumulate
+from math import ceil
+from time import monotonic
+from typing import Any, Final
+
+
+def ewma(average: float | None, value: float, alpha: float = 0.1) -> float:
+    """Return the exponentially weighted moving average updated by a value."""
+    return value if average is None else average + alpha * (value - average)
+
+
+def percentile(values: Iterable[float], percent: float) -> float | None:
+    """Return the nearest-rank percentile of values, if any."""
+
+    if not (samples := sorted(values)):
+        return None
+    return samples[max(ceil(len(samples) * percent / 100) - 1, 0)]
+
+
+class _TimeWindow:
+    """Success ratio over a sliding time window using fixed time buckets."""
+
+    __slots__ = ("_bucket_len", "_ok", "_slot", "_sum_ok", "_sum_total", "_total")
+
+    def __init__(self, span: float, buckets: int) -> None:
+        self._bucket_len: Final[float] = span / buckets
+        self._ok: list[int] = [0] * buckets
+        self._total: list[int] = [0] * buckets
+        self._slot: int | None = None  # absolute index of the current bucket
+        self._sum_ok: int = 0
+        self._sum_total: int = 0
+
+    def _advance(self, now: float) -> int:
+        """Expire buckets that left the window and return the current bucket index."""
+
+        slot: Final[int] = int(now // self._bucket_len)
+        if self._slot is None:
+            self._slot = slot
+        # clear each bucket at most once, i.e. bounded by number of buckets
+        for expired in range(max(self._slot + 1, slot - len(self._ok) + 1), slot + 1):
+            idx: int = expired % len(self._ok)
+            self._sum_ok -= self._ok[idx]
+            self._sum_total -= self._total[idx]
+            self._ok[idx] = self._total[idx] = 0
+        self._slot = max(self._slot, slot)
+        return slot % len(self._ok)
+
+    def add(self, success: bool, count: int, now: float) -> None:
+        """Add a number of attempts with the same outcome."""
+
+        idx: Final[int] = self._advance(now)
+        self._total[idx] += count
+        self._sum_total += count
+        if success:
+            self._ok[idx] += count
+            self._sum_ok += count
+
+    def ratio(self, now: float) -> float | None:
+        """Return the success ratio within the window or None if there was no attempt."""
+
+        self._advance(now)
+        return self._sum_ok / self._sum_total if self._sum_total else None
+
+
+class LinkStats:
+    """Running statistics of BMS update attempts with constant time access."""
+
+    WINDOW: Final[int] = 100  # number of attempts considered for link quality
+    ALPHA: Final[float] = 0.1  # smoothing factor of exponentially weighted averages
+
+    __slots__ = (
+        "_count",
+        "_day",
+        "_hour",
+        "_len",
+        "_pos",
+        "_ring",
+        "attempts",
+        "consecutive_failures",
+        "ewma_latency",
+        "ewma_success",
+        "failures",
+        "successes",
+    )
+
+    def __init__(self) -> None:
+        """Initialize statistics with a single failed attempt."""
+
+        self._ring: bytearray = bytearray(self.WINDOW)
+        self._pos: int = 0  # position of the next attempt in the ring
+        self._len: int = 0  # number of valid attempts in the ring
+        self._count: int = 0  # number of successful attempts in the ring
+        self._hour: Final = _TimeWindow(3600, 60)
+        self._day: Final = _TimeWindow(86400, 24)
+        self.consecutive_failures: int = 0
+        self.ewma_success: float | None = None
+        self.ewma_latency: float | None = None  # [s] of successful attempts
+        self.attempts: int = 0  # total number of attempts including missed ones
+        self.successes: int = 0  # total number of successful attempts
+        self.failures: Final[Counter[str]] = Counter()  # failed updates by reason
+        self._push(False)  # be pessimistic until the first update succeeded
+
+    def _push(self, success: bool) -> None:
+        if self._len == self.WINDOW:
+            self._count -= self._ring[self._pos]
+        else:
+            self._len += 1
+        self._ring[self._pos] = success
+        self._count += success
+        self._pos = (self._pos + 1) % self.WINDOW
+        self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+
+    def record(
+        self,
+        success: bool,
+        latency: float | None = None,
+        missed: int = 0,
+        now: float | None = None,
+    ) -> None:
+        """Record the outcome of an attempt preceded by a number of missed ones."""
+
+        now = monotonic() if now is None else now
+        for _ in range(min(missed, self.WINDOW)):
+            self._push(False)
+        self._push(success)
+        self.attempts += missed + 1
+        self.successes += success
+        for window in (self._hour, self._day):
+            if missed:
+                window.add(False, missed, now)
+            window.add(success, 1, now)
+        self.ewma_success = ewma(self.ewma_success, float(success), self.ALPHA)
+        if success and latency is not None:
+            self.ewma_latency = ewma(self.ewma_latency, latency, self.ALPHA)
+
+    def count_failure(self, reason: str) -> None:
+        """Count a failed update by its reason, e.g. the translation key."""
+        self.failures[reason] += 1
+
+    @property
+    def quality(self) -> int:
+        """Return the percentage of successful attempts out of the last ones."""
+        return self._count * 100 // self._len
+
+    @property
+    def last_success(self) -> bool:
+        """Return whether the latest attempt succeeded."""
+        return self.consecutive_failures == 0
+
+    def hour_ratio(self, now: float | None = None) -> float | None:
+        """Return the success ratio of the last hour."""
+        return self._hour.ratio(monotonic() if now is None else now)
+
+    def day_ratio(self, now: float | None = None) -> float | None:
+        """Return the success ratio of the last day."""
+        return self._day.ratio(monotonic() if now is None else now)
+
+    def as_dict(self, now: float | None = None) -> dict[str, Any]:
+        """Return statistics, e.g. for diagnostics."""
+        now = monotonic() if now is None else now
+        return {
+            "quality": self.quality,
+            "consecutive_failures": self.consecutive_failures,
+            "ewma_success": self.ewma_success,
+            "ewma_latency": self.ewma_latency,
+            "success_hour": self.hour_ratio(now),
+            "success_day": self.day_ratio(now),
+        }
+
+
+class LatencyStats:
+    """Durations of the phases of recent BMS updates."""
+
+    # queue: waiting for a connection slot, reset: disconnect of a stale BMS,
+    # update: connect, request and decode by the BMS library, publish: notify entities
+    PHASES: Final[tuple[str, ...]] = ("queue", "reset", "update", "publish")
+    SAMPLES: Final[int] = 100  # number of durations considered for percentiles
+    # [s] upper bounds of the histogram buckets of all durations
+    BUCKETS: Final[tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    __slots__ = ("_buckets", "_samples", "_sums")
+
+    def __init__(self) -> None:
+        """Initialize statistics without any samples."""
+        self._samples: Final[dict[str, deque[float]]] = {
+            phase: deque(maxlen=self.SAMPLES) for phase in self.PHASES
+        }
+        # counts per bucket, the last one for durations exceeding all bounds
+        self._buckets: Final[dict[str, list[int]]] = {
+            phase: [0] * (len(self.BUCKETS) + 1) for phase in self.PHASES
+        }
+        self._sums: Final[dict[str, float]] = dict.fromkeys(self.PHASES, 0.0)
+
+    def record(self, phase: str, duration: float) -> None:
+        """Record the duration [s] of an update phase."""
+        self._samples[phase].append(duration)
+        self._buckets[phase][bisect_left(self.BUCKETS, duration)] += 1
+        self._sums[phase] += duration
+
+    def total(self, phase: str) -> int:
+        """Return the number of all recorded durations of a phase."""
+        return sum(self._buckets[phase])
+
+    def histogram(self, phase: str) -> tuple[list[int], float]:
+        """Return cumulative bucket counts and sum of all durations of a phase.
+
+        The counts match the bucket bounds followed by the total count.
+        """
+        return list(accumulate(self._buckets[phase])), self._sums[phase]
+
+    def count(self, phase: str) -> int:
+        """Return the number of recent durations of a phase."""
+        return len(self._samples[phase])
+
+    def last(self, phase: str) -> float | None:
+        """Return the latest duration of a phase."""
+        return self._samples[phase][-1] if self._samples[phase] else None
+
+    def percentile(self, phase: str, percent: float) -> float | None:
+        """Return the nearest-rank percentile of the recent durations of a phase."""
+        return percentile(self._samples[phase], percent)
+
+    def as_dict(self) -> dict[str, dict[str, float | None]]:
+        """Return latest, median and 95th percentile per phase, e.g. for diagnostics."""
+        return {
+            phase: {
+                "last": self.last(phase),
+                "p50": self.percentile(phase, 50),
+                "p95": self.percentile(phase, 95),
+            }
+            for phase in self.PHASES
+        }
@@ -0,0 +1,52 @@
+"""Persistent storage of BMS data for BLE Battery Management System integration."""
+
+from collections.abc import Callable
+from pathlib import Path
+from time import monotonic
+from typing import Final, TypedDict
+
+from aiobmsble import BMSInfo, BMSSample
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORE_DELAY
+
+STORAGE_VERSION: Final[int] = 1
+
+
+def archive_path(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the directory of the sample archive of a config entry."""
+    return Path(hass.config.path(DOMAIN, entry_id))
+
+
+def export_path(hass: HomeAssistant) -> Path:
+    """Return the directory of the exported samples of all config entries."""
+    return Path(hass.config.path(DOMAIN, "export"))
+
+
+class StoredData(TypedDict, total=False):
+    """Data of a BMS kept across restarts."""
+
+    sample: BMSSample
+    timestamp: float  # POSIX timestamp of the sample
+    device_info: BMSInfo
+    info_timestamp: float  # POSIX timestamp the device information was read
+
+
+class BmsStore(Store[StoredData]):
+    """Store for the data of a single BMS config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of a config entry."""
+        super().__init__(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._save_due: float = 0  # earliest monotonic time of the next write
+
+    @callback
+    def async_throttled_save(self, data_func: Callable[[], StoredData]) -> None:
+        """Save the data after a delay, at most once per delay."""
+
+        if (now := monotonic()) < self._save_due:
+            return  # the pending write stores the latest data
+        self._save_due = now + STORE_DELAY
+        self.async_delay_save(data_func, STORE_DELAY)
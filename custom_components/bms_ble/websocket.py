@@ -0,0 +1,239 @@
+"""Websocket commands of the BLE Battery Management System integration."""
+
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+from functools import partial
+from math import inf
+from time import monotonic
+from typing import Any, Final
+
+from aiobmsble import BMSSample
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, MAX_INTERVAL
+from .coordinator import SIGNAL_SAMPLE
+from .downsample import lttb, min_max
+from .history import SampleHistory
+from .services import async_get_coordinator
+
+ATTR_ENTRY_IDS: Final[str] = "entry_ids"
+ATTR_THROTTLE: Final[str] = "throttle"
+DEFAULT_THROTTLE: Final[float] = 1.0  # [s] minimum time between two messages
+DOWNSAMPLING: Final = {"lttb": lttb, "min_max": min_max}  # methods of history queries
+MAX_POINTS: Final[int] = 5000  # limit of points per series of a history query
+
+
+class SampleStream:
+    """Changed fields of the samples of several BMS sent to one subscriber."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        throttle: float,
+    ) -> None:
+        """Initialize the stream of a subscription."""
+
+        self._hass: Final = hass
+        self._connection: Final = connection
+        self._msg_id: Final[int] = msg_id
+        self._throttle: Final[float] = throttle
+        self._sent: Final[dict[str, Mapping[str, object]]] = {}  # latest sent sample
+        self._pending: Final[dict[str, BMSSample]] = {}  # latest unsent sample
+        self._due: float = 0  # earliest monotonic time of the next message
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add(self, entry_id: str, sample: BMSSample) -> None:
+        """Send a sample of a config entry once the throttle allows it."""
+
+        self._pending[entry_id] = sample
+        if self._unsub_timer is not None:
+            return  # the scheduled message includes the latest sample
+        if (delay := self._due - monotonic()) > 0:
+            self._unsub_timer = async_call_later(self._hass, delay, self._async_send)
+            return
+        self._async_send()
+
+    @callback
+    def _async_send(self, _now: datetime | None = None) -> None:
+        """Send the fields that changed since the previous message, None if removed."""
+
+        self._unsub_timer = None
+        samples: Final[dict[str, dict[str, Any]]] = {}
+        for entry_id, sample in self._pending.items():
+            sent: Mapping[str, object] = self._sent.get(entry_id, {})
+            if changes := {
+                key: value
+                for key, value in sample.items()
+                if key not in sent or sent[key] != value
+            } | {key: None for key in sent if key not in sample}:
+                samples[entry_id] = changes
+            self._sent[entry_id] = sample
+        self._pending.clear()
+        if samples:
+            self._connection.send_message(
+                websocket_api.event_message(self._msg_id, {"samples": samples})
+            )
+            self._due = monotonic() + self._throttle
+
+    @callback
+    def async_send_all(self, samples: dict[str, BMSSample]) -> None:
+        """Send the given samples of all config entries immediately."""
+        self.async_cancel()
+        self._pending.update(samples)
+        self._async_send()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel a scheduled message."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(ATTR_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_THROTTLE, default=DEFAULT_THROTTLE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_INTERVAL)
+        ),
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the samples of BMS, the first message contains all fields."""
+
+    try:
+        coordinators: Final = {
+            entry_id: async_get_coordinator(hass, entry_id)
+            for entry_id in msg[ATTR_ENTRY_IDS]
+        }
+    except ServiceValidationError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+
+    stream: Final = SampleStream(hass, connection, msg["id"], msg[ATTR_THROTTLE])
+    unsubs: Final[list[CALLBACK_TYPE]] = [
+        async_dispatcher_connect(
+            hass, SIGNAL_SAMPLE.format(entry_id), partial(stream.async_add, entry_id)
+        )
+        for entry_id in coordinators
+    ]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Stop sending samples to the subscriber."""
+        for unsub in unsubs:
+            unsub()
+        stream.async_cancel()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    stream.async_send_all(
+        {
+            entry_id: coordinator.data
+            for entry_id, coordinator in coordinators.items()
+            if coordinator.data
+        }
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("entry_id"): cv.string,
+        vol.Optional("fields", default=[]): vol.All(
+            cv.ensure_list, [vol.In(SampleHistory.FIELDS)]
+        ),
+        vol.Optional("cells", default=[]): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=0))]
+        ),
+        vol.Optional("start_time"): cv.datetime,
+        vol.Optional("end_time"): cv.datetime,
+        vol.Optional("points", default=500): vol.All(
+            vol.Coerce(int), vol.Range(min=3, max=MAX_POINTS)
+        ),
+        vol.Optional("method", default="lttb"): vol.In(DOWNSAMPLING),
+        vol.Optional("archive", default=False): cv.boolean,
+    }
+)
+@websocket_api.async_response
+async def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the downsampled history of fields and cell voltages of a BMS.
+
+    The samples are read from the on-disk archive if requested, else from memory.
+    Either way, downsampling runs in the executor.
+    """
+
+    try:
+        coordinator: Final = async_get_coordinator(hass, msg["entry_id"])
+    except ServiceValidationError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+    source: Final = coordinator.archive if msg["archive"] else coordinator.history
+    if source is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_SUPPORTED, "Sample archive is disabled"
+        )
+        return
+
+    downsample: Final = DOWNSAMPLING[msg["method"]]
+    start: Final[float] = msg["start_time"].timestamp() if "start_time" in msg else 0
+    end: Final[float] = msg["end_time"].timestamp() if "end_time" in msg else inf
+
+    def _read() -> list[tuple[array[float], array[float]]]:
+        """Return timestamps and values of all requested fields and cells."""
+        return [
+            source.series(column, start, end)
+            for column in (*msg["fields"], *msg["cells"])
+        ]
+
+    def _query(
+        series: list[tuple[array[float], array[float]]] | None,
+    ) -> dict[str, Any]:
+        """Return the downsampled series, read from the source if not given."""
+
+        results: Final[list[dict[str, list[float]]]] = []
+        for data in _read() if series is None else series:
+            times, values = downsample(*data, msg["points"])
+            # values are stored with single precision
+            results.append(
+                {"time": times.tolist(), "value": [round(val, 3) for val in values]}
+            )
+        fields: Final[int] = len(msg["fields"])
+        return {
+            "fields": dict(zip(msg["fields"], results[:fields], strict=True)),
+            "cells": results[fields:],
+        }
+
+    # the in-memory history is copied on the event loop, as samples keep arriving
+    connection.send_result(
+        msg["id"],
+        await hass.async_add_executor_job(_query, None if msg["archive"] else _read()),
+    )
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_history)
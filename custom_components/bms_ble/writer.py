@@ -0,0 +1,70 @@
+"""Batched file writers for BLE Battery Management System integration."""
+
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import monotonic
+from typing import Final
+
+from aiobmsble import BMSSample
+
+
+class BatchWriter[T](ABC):
+    """Records buffered in memory and written to files in batches.
+
+    Records are added on the event loop. Once `due`, the coordinator hands the
+    records from `take` to `write`, which is meant to run in the executor.
+    """
+
+    BATCH_RECORDS: Final[int] = 120  # records that trigger a write
+    BATCH_AGE: Final[int] = 300  # [s] age of the oldest record that triggers a write
+
+    __slots__ = ("_lock", "_pending", "_pending_since", "_writing")
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self._pending: list[T] = []  # records not yet written
+        self._pending_since: float = 0  # monotonic time of the oldest pending record
+        self._writing: bool = False  # a batch is handed to the executor
+        self._lock: Final = Lock()  # serializes file access
+
+    @abstractmethod
+    def add(self, sample: BMSSample, now: float | None = None) -> None:
+        """Add a sample taken at the given POSIX time, default is now."""
+
+    def _append(self, record: T) -> None:
+        """Add a record to the pending batch."""
+        if not self._pending:
+            self._pending_since = monotonic()
+        self._pending.append(record)
+
+    def due(self) -> bool:
+        """Return whether the pending records should be written."""
+        return not self._writing and (
+            len(self._pending) >= self.BATCH_RECORDS
+            or (
+                bool(self._pending)
+                and monotonic() - self._pending_since >= self.BATCH_AGE
+            )
+        )
+
+    def take(self) -> list[T]:
+        """Return the pending records for a write."""
+
+        records: Final[list[T]] = self._pending
+        self._pending = []
+        self._writing = True
+        return records
+
+    def write(self, records: list[T]) -> None:
+        """Write a batch of records, blocking."""
+
+        try:
+            with self._lock:
+                if records:
+                    self._write(records)
+        finally:
+            self._writing = False
+
+    @abstractmethod
+    def _write(self, records: list[T]) -> None:
+        """Write a non-empty batch of records to the files."""
@@ -143,7 +143,7 @@ def bt_discovery_notsupported() -> BluetoothServiceInfoBleak:
 def mock_config(
     bms: str = "dummy_bms",
     unique_id: str | None = "cc:cc:cc:cc:cc:cc",
-    options: dict[str, str] | None = None,
+    options: dict[str, Any] | None = None,
 ) -> MockConfigEntry:
     """Return a Mock of the HA entity config (latest version)."""
     return MockConfigEntry(
@@ -257,7 +257,7 @@ class MockBMS(BaseBMS):
         if self._exception:
             raise self._exception
 
-        return self._ret_value
+        return self._ret_value.copy()
 
 
 class MockBleakClient(BleakClient):
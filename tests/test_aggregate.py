@@ -0,0 +1,69 @@
+"""Test the BLE Battery Management System sample aggregation."""
+
+from datetime import timedelta
+from typing import Final
+
+from aiobmsble import BMSSample
+import pytest
+
+from custom_components.bms_ble.aggregate import BurstCapture, SampleAggregator
+
+
+def test_aggregate() -> None:
+    """Test mean and extremes of aggregated samples."""
+
+    agg: Final[SampleAggregator] = SampleAggregator()
+    assert not agg
+
+    samples: Final[list[BMSSample]] = [
+        {"voltage": 13.0, "current": -1.0, "battery_level": 50, "cycles": 3},
+        {"voltage": 13.2, "current": 8.0, "battery_level": 51, "cycles": 3},
+        {"voltage": 13.1, "current": 2.0, "battery_level": 51, "cycles": 4},
+    ]
+    for sample in samples:
+        agg.add(sample)
+    assert len(agg) == 3
+
+    result, extremes = agg.pop()
+    assert result == {
+        "voltage": 13.1,
+        "current": 3.0,
+        "battery_level": 51,
+        "cycles": 4,
+    }
+    assert extremes == {"current": (-1.0, 8.0), "voltage": (13.0, 13.2)}
+    assert not agg
+
+
+def test_aggregate_missing_fields() -> None:
+    """Test that fields missing in the latest sample are not published."""
+
+    agg: Final[SampleAggregator] = SampleAggregator()
+    agg.add({"voltage": 12.0, "power": 10.0})
+    agg.add({"voltage": 14.0})
+
+    assert agg.pop() == ({"voltage": 13.0}, {"voltage": (12.0, 14.0)})
+
+
+def test_burst_capture(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that samples are only captured during the burst and bounded."""
+
+    monkeypatch.setattr(BurstCapture, "SAMPLES", 3)
+    burst: Final[BurstCapture] = BurstCapture()
+    burst.add({"voltage": 12.0})
+    assert not burst.active
+    assert not burst
+
+    burst.start(timedelta(minutes=1))
+    assert burst.active
+    for voltage in range(5):
+        burst.add({"voltage": float(voltage)})
+    assert [entry["sample"] for entry in burst.as_list()] == [
+        {"voltage": 2.0},
+        {"voltage": 3.0},
+        {"voltage": 4.0},
+    ]
+
+    burst.start(timedelta(0))
+    assert not burst.active
+    assert not burst, "a new burst discards the previous samples"
@@ -0,0 +1,94 @@
+"""Test the BLE Battery Management System on-disk sample archive."""
+
+from pathlib import Path
+from time import time
+from typing import Final
+
+import pytest
+
+from custom_components.bms_ble.archive import HEADER, SampleArchive
+
+
+def test_archive(tmp_path: Path) -> None:
+    """Test writing batches and reading fields and cells back."""
+
+    archive: Final[SampleArchive] = SampleArchive(tmp_path, 86400)
+    now: Final[float] = time()
+    for idx in range(SampleArchive.BATCH_RECORDS - 1):
+        archive.add(
+            {"voltage": 13.0, "current": float(idx), "cell_voltages": [3.25, 3.5]},
+            now - 1000 + idx,
+        )
+    assert not archive.due()
+    archive.add({"voltage": 13.5}, now)
+    assert archive.due()
+    archive.write(archive.take())
+    assert not archive.due()
+
+    times, values = archive.series("current")
+    assert len(times) == len(values) == SampleArchive.BATCH_RECORDS - 1
+    assert values[3] == 3
+    assert list(archive.series("voltage", now - 1)[1]) == [13.5]
+    assert list(archive.series("current", now - 1000, now - 998)[1]) == [0, 1, 2]
+    assert archive.series(1)[1][0] == 3.5
+    assert not archive.series(2)[0]
+    assert not archive.series("current", now + 1)[0]
+
+
+def test_archive_restart(tmp_path: Path) -> None:
+    """Test that an archive continues the latest segment and drops partial records."""
+
+    archive: SampleArchive = SampleArchive(tmp_path, 86400)
+    now: Final[float] = time()
+    archive.add({"voltage": 13.0}, now - 1)
+    archive.write(archive.take())
+    (segment,) = tmp_path.glob("*.bin")
+    with segment.open("ab") as file:
+        file.write(b"\x00" * 5)  # incomplete record, e.g. power loss
+
+    archive = SampleArchive(tmp_path, 86400)
+    archive.add({"voltage": 13.5}, now)
+    archive.write(archive.take())
+    assert list(tmp_path.glob("*.bin")) == [segment]
+    assert list(archive.series("voltage")[1]) == [13.0, 13.5]
+    assert segment.stat().st_size == HEADER.size + 2 * 4 * (
+        2 + len(SampleArchive.FIELDS)
+    )
+
+
+def test_archive_rotation(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that segments rotate and expire after the retention time."""
+
+    archive: Final[SampleArchive] = SampleArchive(tmp_path, 2 * 86400)
+    now: Final[float] = float(int(time()))  # segment names are full seconds
+    for day in range(4, -1, -1):
+        monkeypatch.setattr(
+            "custom_components.bms_ble.archive.time", lambda day=day: now - day * 86400
+        )
+        archive.add({"voltage": 13.0 + day}, now - day * 86400)
+        archive.write(archive.take())
+    # the segment started 3 days ago holds records up to the one 2 days ago
+    assert len(list(tmp_path.glob("*.bin"))) == 4
+    assert list(archive.series("voltage")[1]) == [16, 15, 14, 13]
+
+    # changed number of cells starts a new segment
+    archive.add({"cell_voltages": [3.3]}, now + 1)
+    archive.write(archive.take())
+    assert len(list(tmp_path.glob("*.bin"))) == 5
+    assert list(archive.series(0)[1]) == pytest.approx([3.3])
+
+
+@pytest.mark.parametrize("header", [b"BMS", b"XXXX\x01\x00\x00\x00"])
+def test_archive_corrupt_segment(tmp_path: Path, header: bytes) -> None:
+    """Test that a truncated or corrupt latest segment starts a new one."""
+
+    now: Final[float] = time()
+    corrupt: Final[Path] = tmp_path / f"{int(now) - 10}.bin"
+    corrupt.write_bytes(header)
+
+    archive: Final[SampleArchive] = SampleArchive(tmp_path, 86400)
+    archive.add({"voltage": 13.0}, now)
+    archive.write(archive.take())
+    assert corrupt.read_bytes() == header
+    assert len(list(tmp_path.glob("*.bin"))) == 2
+    assert list(archive.series("voltage")[1]) == [13.0]
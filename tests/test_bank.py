@@ -0,0 +1,231 @@
+"""Test the BLE Battery Management System battery bank."""
+
+from typing import Final
+
+from aiobmsble import BMSSample
+from habluetooth import BluetoothServiceInfoBleak
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bms_ble.bank import BTBankCoordinator
+from custom_components.bms_ble.config_flow import ConfigFlow
+from custom_components.bms_ble.const import (
+    ATTR_BATTERY_LEVEL,
+    ATTR_CURRENT,
+    ATTR_CYCLE_CAP,
+    ATTR_MAX_VOLTAGE,
+    ATTR_MIN_VOLTAGE,
+    ATTR_POWER,
+    BANK_TYPE,
+    CONF_MEMBERS,
+    DOMAIN,
+)
+from custom_components.bms_ble.coordinator import BTBmsCoordinator
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+
+from .conftest import MockBMS, mock_config
+
+BATTERY_A: Final[BMSSample] = {
+    "current": 2.5,
+    "power": 33.0,
+    "cycle_capacity": 1200.0,
+    "battery_level": 80,
+    "design_capacity": 100,
+    "cell_voltages": [3.30, 3.31, 3.29, 3.30],
+}
+BATTERY_B: Final[BMSSample] = {
+    "current": -1.0,
+    "power": -13.0,
+    "cycle_capacity": 300.0,
+    "battery_level": 50,
+    "design_capacity": 50,
+    "cell_voltages": [3.25, 3.34, 3.28, 3.27],
+}
+
+
+def mock_bank(members: list[str]) -> MockConfigEntry:
+    """Return a Mock of a battery bank config entry."""
+    return MockConfigEntry(
+        data={"type": BANK_TYPE, CONF_MEMBERS: members},
+        domain=DOMAIN,
+        minor_version=ConfigFlow.MINOR_VERSION,
+        title="config_test_bank",
+        version=ConfigFlow.VERSION,
+    )
+
+
+async def _mock_members(
+    hass: HomeAssistant, bt_discovery: BluetoothServiceInfoBleak
+) -> tuple[list[MockBMS], list[MockConfigEntry]]:
+    """Return loaded member config entries with refreshed coordinators."""
+
+    bms: Final[list[MockBMS]] = [
+        MockBMS(ret_value=BATTERY_A.copy()),
+        MockBMS(ret_value=BATTERY_B.copy()),
+    ]
+    entries: Final[list[MockConfigEntry]] = []
+    for idx, device in enumerate(bms):
+        entry: MockConfigEntry = mock_config(
+            bms=f"member{idx}", unique_id=f"cc:cc:cc:cc:cc:c{idx}"
+        )
+        entry.add_to_hass(hass)
+        entry.runtime_data = BTBmsCoordinator(hass, bt_discovery.device, device, entry)
+        await entry.runtime_data.async_refresh()
+        entry.mock_state(hass, ConfigEntryState.LOADED)
+        entries.append(entry)
+    return bms, entries
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_bank_update(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that bank values follow the updates of its members."""
+
+    bms, entries = await _mock_members(hass, bt_discovery)
+    bank_entry: Final[MockConfigEntry] = mock_bank([e.entry_id for e in entries])
+    bank_entry.add_to_hass(hass)
+    bank: Final = BTBankCoordinator(
+        hass, bank_entry, {e.entry_id: e.runtime_data for e in entries}
+    )
+    stop: Final = bank.async_start()
+
+    assert bank.data == {
+        ATTR_CURRENT: 1.5,
+        ATTR_POWER: 20.0,
+        ATTR_CYCLE_CAP: 1500.0,
+        ATTR_BATTERY_LEVEL: 70.0,  # weighted by design capacity
+        ATTR_MAX_VOLTAGE: 3.34,
+        ATTR_MIN_VOLTAGE: 3.25,
+    }
+
+    bms[1]._ret_value["current"] = 1.0
+    await entries[1].runtime_data.async_refresh()
+    assert bank.data[ATTR_CURRENT] == 3.5
+
+    # without the capacity of a member, all members count the same
+    del bms[1]._ret_value["design_capacity"]
+    await entries[1].runtime_data.async_refresh()
+    assert bank.data[ATTR_BATTERY_LEVEL] == 65.0
+
+    # failed member does not contribute
+    bms[0]._exception = TimeoutError()
+    await entries[0].runtime_data.async_refresh()
+    assert bank.data == {
+        ATTR_CURRENT: 1.0,
+        ATTR_POWER: -13.0,
+        ATTR_CYCLE_CAP: 300.0,
+        ATTR_BATTERY_LEVEL: 50.0,
+        ATTR_MAX_VOLTAGE: 3.34,
+        ATTR_MIN_VOLTAGE: 3.25,
+    }
+
+    stop()
+    bms[0]._exception = None
+    await entries[0].runtime_data.async_refresh()
+    assert bank.data[ATTR_CURRENT] == 1.0, "bank must not update after stop"
+
+    for entry in entries:
+        await entry.runtime_data.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_bank_setup(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test setup of a battery bank entry with its sensors."""
+
+    _bms, entries = await _mock_members(hass, bt_discovery)
+    bank_entry: Final[MockConfigEntry] = mock_bank([e.entry_id for e in entries])
+    bank_entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(bank_entry.entry_id)
+    await hass.async_block_till_done()
+    assert bank_entry.state is ConfigEntryState.LOADED
+
+    ent_reg: Final[er.EntityRegistry] = er.async_get(hass)
+    for key, value in ((ATTR_CURRENT, "1.5"), (ATTR_POWER, "20.0")):
+        entity_id = ent_reg.async_get_entity_id(
+            "sensor", DOMAIN, f"{DOMAIN}-{bank_entry.entry_id}-{key}"
+        )
+        assert entity_id is not None
+        state = hass.states.get(entity_id)
+        assert state is not None and state.state == value
+
+    assert await hass.config_entries.async_unload(bank_entry.entry_id)
+    for entry in entries:
+        await entry.runtime_data.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_bank_setup_members_missing(hass: HomeAssistant) -> None:
+    """Test that bank setup waits for members and fails for removed ones."""
+
+    member: Final[MockConfigEntry] = mock_config()
+    member.add_to_hass(hass)
+    waiting: Final[MockConfigEntry] = mock_bank([member.entry_id])
+    waiting.add_to_hass(hass)
+
+    assert not await hass.config_entries.async_setup(waiting.entry_id)
+    assert waiting.state is ConfigEntryState.SETUP_RETRY
+
+    removed: Final[MockConfigEntry] = mock_bank(["invalid_entry_id"])
+    removed.add_to_hass(hass)
+
+    assert not await hass.config_entries.async_setup(removed.entry_id)
+    assert removed.state is ConfigEntryState.SETUP_ERROR
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_bank_config_flow(hass: HomeAssistant) -> None:
+    """Test creating a battery bank from configured batteries."""
+
+    members: Final[list[MockConfigEntry]] = [
+        mock_config(bms=f"member{idx}", unique_id=f"cc:cc:cc:cc:cc:c{idx}")
+        for idx in range(2)
+    ]
+    for member in members:
+        member.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result.get("type") is FlowResultType.MENU
+    assert result.get("menu_options") == ["device", "bank"]
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "bank"}
+    )
+    assert result.get("type") is FlowResultType.FORM
+    assert result.get("step_id") == "bank"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_NAME: "My bank", CONF_MEMBERS: [members[0].entry_id]},
+    )
+    assert result.get("errors") == {"base": "bank_members"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_NAME: "My bank", CONF_MEMBERS: [m.entry_id for m in members]},
+    )
+    assert result.get("type") is FlowResultType.CREATE_ENTRY
+    assert result.get("title") == "My bank"
+    assert result.get("data") == {
+        "type": BANK_TYPE,
+        CONF_MEMBERS: [m.entry_id for m in members],
+    }
+    await hass.async_block_till_done()
+
+    bank_entry = result.get("result")
+    assert bank_entry is not None
+    assert not ConfigFlow.async_supports_options_flow(bank_entry)
+    assert ConfigFlow.async_supports_options_flow(members[0])
@@ -73,7 +73,10 @@ async def test_update(
 
     monkeypatch.setattr(f"{bms_class}.async_update", patch_async_update)
 
-    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=UPDATE_INTERVAL))
+    # first poll after setup is shifted by the phase offset of up to one interval
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=2 * UPDATE_INTERVAL)
+    )
     await hass.async_block_till_done()
 
     for sensor, attribute, ref_state, ref_value in (
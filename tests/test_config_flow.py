@@ -17,6 +17,10 @@ from custom_components.bms_ble.const import (
     BINARY_SENSORS,
     CONF_ADVANCED_OPTIONS,
     CONF_KEEP_ALIVE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PUSH_MODE,
+    CONF_SAMPLE_INTERVAL,
     DOMAIN,
     LINK_SENSORS,
     SENSORS,
@@ -566,6 +570,62 @@ async def test_options_effect(
     assert options.get(CONF_PASSWORD) == "123abc"
 
 
+@pytest.mark.usefixtures("enable_bluetooth")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_options_flow_invalid(hass: HomeAssistant) -> None:
+    """Test that options flow rejects inconsistent advanced options."""
+
+    cfg: MockConfigEntry = mock_config()
+    cfg.add_to_hass(hass)
+
+    result: ConfigFlowResult = await hass.config_entries.options.async_init(
+        cfg.entry_id
+    )
+    invalid: Final[dict[str, Any]] = {
+        CONF_ADVANCED_OPTIONS: {CONF_MIN_INTERVAL: 60, CONF_MAX_INTERVAL: 10}
+    }
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=invalid
+    )
+
+    assert result.get("type") is FlowResultType.FORM
+    assert result.get("errors") == {"base": "invalid_interval"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_ADVANCED_OPTIONS: {CONF_KEEP_ALIVE: False, CONF_PUSH_MODE: True}},
+    )
+
+    assert result.get("type") is FlowResultType.FORM
+    assert result.get("errors") == {"base": "push_requires_keep_alive"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_ADVANCED_OPTIONS: {CONF_MIN_INTERVAL: 10, CONF_SAMPLE_INTERVAL: 10}
+        },
+    )
+
+    assert result.get("type") is FlowResultType.FORM
+    assert result.get("errors") == {"base": "invalid_sample_interval"}
+
+    valid: Final[dict[str, Any]] = {
+        CONF_ADVANCED_OPTIONS: {
+            CONF_KEEP_ALIVE: True,
+            CONF_MIN_INTERVAL: 10,
+            CONF_MAX_INTERVAL: 60,
+            CONF_SAMPLE_INTERVAL: 5,
+        }
+    }
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=valid
+    )
+    await hass.async_block_till_done()
+
+    assert result.get("type") is FlowResultType.CREATE_ENTRY
+    assert cfg.options == valid
+
+
 @pytest.mark.usefixtures("enable_bluetooth")
 @pytest.mark.parametrize("expected_lingering_timers", [True])
 async def test_invalid_options_flow(hass: HomeAssistant) -> None:
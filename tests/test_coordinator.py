@@ -1,14 +1,23 @@
 """Test the BLE Battery Management System update coordinator."""
 
+import asyncio
 from collections.abc import Awaitable, Callable
 import contextlib
-from typing import Final
+import csv
+from datetime import timedelta
+from pathlib import Path
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any, Final
 
-from aiobmsble import BMSSample
+from aiobmsble import BMSInfo, BMSSample
+from bleak.backends.device import BLEDevice
 from bleak.exc import BleakError
 from habluetooth import BluetoothServiceInfoBleak
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.bms_ble.archive import SampleArchive
 from custom_components.bms_ble.const import (
     ATTR_CURRENT,
     ATTR_CYCLE_CAP,
@@ -16,13 +25,42 @@ from custom_components.bms_ble.const import (
     ATTR_CYCLES,
     ATTR_POWER,
     ATTR_PROBLEM,
+    CONF_ADAPTIVE_KEEP_ALIVE,
+    CONF_ADVANCED_OPTIONS,
+    CONF_ARCHIVE,
+    CONF_CURRENT_DEADBAND,
+    CONF_EXPORT,
+    CONF_KEEP_ALIVE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PUSH_INTERVAL,
+    CONF_PUSH_MODE,
+    CONF_SAMPLE_INTERVAL,
+    CONF_VOLTAGE_DEADBAND,
+    DEFAULT_FRESHNESS,
+    DOMAIN,
+    INFO_MAX_AGE,
+    INFO_RETRY,
+    RESTORE_MAX_AGE,
+    TIMEOUT_MAX,
+    TIMEOUT_MIN,
+    TIMEOUT_SAMPLES,
+    UPDATE_INTERVAL,
 )
 from custom_components.bms_ble.coordinator import BTBmsCoordinator
+from custom_components.bms_ble.stats import LatencyStats
+from homeassistant.components.bluetooth import BluetoothChange
 from homeassistant.const import ATTR_BATTERY_CHARGING, ATTR_VOLTAGE
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .bluetooth import inject_bluetooth_service_info_bleak
+from .bluetooth import (
+    generate_advertisement_data,
+    generate_ble_device,
+    inject_bluetooth_service_info_bleak,
+)
 from .conftest import MockBMS, mock_config
 
 
@@ -100,6 +138,9 @@ async def test_nodata(
     await coordinator.async_refresh()
     result: BMSSample = coordinator.data
     assert not coordinator.last_update_success
+    # source failover sees the failure as well
+    assert coordinator.source_stats[coordinator.source].attempts == 1
+    assert coordinator.source_stats[coordinator.source].successes == 0
 
     await coordinator.async_shutdown()
 
@@ -130,6 +171,429 @@ async def test_update_exception(
     await coordinator.async_refresh()
     assert not coordinator.last_update_success
     assert isinstance(coordinator.last_exception, UpdateFailed)
+    assert coordinator.link_stats.failures == {
+        coordinator.last_exception.translation_key: 1
+    }
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_learned_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that updates on a kept connection are limited by their learned latency."""
+
+    disconnects: list[bool] = []
+    connected: list[bool] = [True]
+
+    async def _mock_disconnect(_self: MockBMS, reset: bool = False) -> None:
+        disconnects.append(reset)
+
+    monkeypatch.setattr(MockBMS, "disconnect", _mock_disconnect)
+    monkeypatch.setattr(MockBMS, "is_connected", property(lambda _self: connected[0]))
+
+    bms: Final[MockBMS] = MockBMS(ret_value={"voltage": 13.0})
+    coordinator = BTBmsCoordinator(
+        hass, bt_discovery.device, bms, mock_config(bms="learned_timeout")
+    )
+    assert coordinator.timeout is None, "no timeout before enough samples"
+
+    for _ in range(TIMEOUT_SAMPLES - 1):
+        await coordinator.async_refresh()
+    assert coordinator.timeout is None
+    await coordinator.async_refresh()
+    assert coordinator.timeout == TIMEOUT_MIN
+    coordinator._kept_updates.extend((100, 100))
+    assert coordinator.timeout == TIMEOUT_MAX
+
+    # a hung query on a kept connection fails fast without backing off
+    coordinator._kept_updates.extend([0.001] * LatencyStats.SAMPLES)
+    monkeypatch.setattr("custom_components.bms_ble.coordinator.TIMEOUT_MIN", 0.01)
+    assert coordinator.timeout == 0.01
+
+    async def _mock_slow_update(_self: MockBMS) -> BMSSample:
+        await asyncio.sleep(0.1)
+        return {"voltage": 13.0}
+
+    monkeypatch.setattr(MockBMS, "async_update", _mock_slow_update)
+    start: Final[float] = monotonic()
+    await coordinator.async_refresh()
+    assert monotonic() - start < 0.1
+    assert not coordinator.last_update_success
+    assert isinstance(coordinator.last_exception, UpdateFailed)
+    assert coordinator.last_exception.translation_key == "bms_timeout"
+    assert disconnects == [True]
+    await coordinator.async_refresh()
+    assert coordinator.backoff is None, "expired budgets shall not back off"
+
+    # a slow update that connects is not limited and not learned
+    connected[0] = False
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.timeout == 0.01
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_restore(
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that the latest sample is persisted and restored until an update."""
+
+    config: Final = mock_config(bms="restore")
+    bms: Final[MockBMS] = MockBMS(ret_value={"voltage": 13.0})
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, bms, config)
+    assert not await coordinator.async_restore(), "nothing stored yet"
+
+    await coordinator.async_refresh()
+    await coordinator.async_shutdown()
+    stored: Final = hass_storage[f"{DOMAIN}.{config.entry_id}"]["data"]
+    assert stored["sample"] == {"voltage": 13.0}
+
+    bms._exception = BleakError()
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, bms, config)
+    assert await coordinator.async_restore()
+    assert coordinator.data == {"voltage": 13.0}
+    assert coordinator.restored is not None
+    assert not coordinator.last_update_success
+
+    # restored sample is kept until the device answers
+    await coordinator.async_refresh()
+    assert coordinator.data == {"voltage": 13.0}
+    assert coordinator.restored is not None
+
+    bms._exception = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.restored is None
+    await coordinator.async_shutdown()
+
+    # outdated samples are not restored
+    hass_storage[f"{DOMAIN}.{config.entry_id}"]["data"]["timestamp"] -= (
+        RESTORE_MAX_AGE + 1
+    )
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, bms, config)
+    assert not await coordinator.async_restore()
+    assert coordinator.data is None
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_device_info_cache(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that device information is stored and only read again when outdated."""
+
+    reads: list[BMSInfo] = []
+
+    async def _mock_device_info(_self: MockBMS) -> BMSInfo:
+        reads.append({"model": f"model{len(reads) + 1}"})
+        return reads[-1]
+
+    monkeypatch.setattr(MockBMS, "device_info", _mock_device_info)
+
+    config: Final = mock_config(bms="device_info")
+    config.add_to_hass(hass)
+    bms: Final[MockBMS] = MockBMS(ret_value={"voltage": 13.0})
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, bms, config)
+    assert not await coordinator.async_restore()
+    await coordinator._async_setup()
+    assert len(reads) == 1
+    await coordinator.async_shutdown()
+
+    # setup after restart uses the stored device information
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, bms, config)
+    assert not await coordinator.async_restore(), "no sample stored"
+    await coordinator._async_setup()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(reads) == 1
+    assert coordinator.device_info.get("model") == "model1"
+
+    # outdated information is read again in the background
+    coordinator._info_time = 0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(reads) == 2
+    assert coordinator.device_info.get("model") == "model2"
+    device: Final = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, bt_discovery.address)}
+    )
+    assert device is not None and device.model == "model2"
+
+    await coordinator.async_shutdown()
+    stored: Final = hass_storage[f"{DOMAIN}.{config.entry_id}"]["data"]
+    assert stored["device_info"] == {"model": "model2"}
+    assert stored["sample"] == {"voltage": 13.0}
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_device_info_retry(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that a failed initial read of the device information is retried."""
+
+    reads: list[BMSInfo] = []
+
+    async def _mock_device_info(_self: MockBMS) -> BMSInfo:
+        reads.append({"model": "model1"})
+        if len(reads) == 1:
+            raise BleakError
+        return reads[-1]
+
+    monkeypatch.setattr(MockBMS, "device_info", _mock_device_info)
+
+    config: Final = mock_config(bms="device_info")
+    config.add_to_hass(hass)
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, MockBMS(), config)
+    with pytest.raises(BleakError):
+        await coordinator._async_setup()
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(reads) == 2
+    assert coordinator.device_info.get("model") == "model1"
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_device_info_refresh_failed(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that a failed background read keeps the information and retries later."""
+
+    reads: list[BMSInfo] = []
+
+    async def _mock_device_info(_self: MockBMS) -> BMSInfo:
+        reads.append({"model": f"model{len(reads) + 1}"})
+        if len(reads) > 1:
+            raise TimeoutError
+        return reads[-1]
+
+    monkeypatch.setattr(MockBMS, "device_info", _mock_device_info)
+
+    config: Final = mock_config(bms="device_info")
+    config.add_to_hass(hass)
+    coordinator = BTBmsCoordinator(hass, bt_discovery.device, MockBMS(), config)
+    await coordinator._async_setup()
+
+    coordinator._info_time = 0  # outdated information
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(reads) == 2
+    assert coordinator.last_update_success
+    assert coordinator.device_info.get("model") == "model1"
+    assert "info" not in coordinator._tasks
+
+    # the read is retried after a delay, not with the next update
+    assert coordinator._info_time is not None
+    retry: Final[float] = coordinator._info_time + INFO_MAX_AGE
+    assert retry == pytest.approx(dt_util.utcnow().timestamp() + INFO_RETRY, abs=5)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(reads) == 2
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_archive(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Test that samples are written to the archive and the export in batches."""
+
+    monkeypatch.setattr(hass.config, "config_dir", str(tmp_path))
+    monkeypatch.setattr(SampleArchive, "BATCH_RECORDS", 2)
+    bms: Final[MockBMS] = MockBMS(ret_value={"voltage": 13.0})
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        bms,
+        mock_config(
+            bms="archive",
+            options={CONF_ADVANCED_OPTIONS: {CONF_ARCHIVE: 7, CONF_EXPORT: "csv"}},
+        ),
+    )
+    assert coordinator.archive is not None
+
+    for voltage in (13.0, 13.5, 14.0):
+        bms._ret_value = {"voltage": voltage}
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    _times, values = await hass.async_add_executor_job(
+        coordinator.archive.series, "voltage"
+    )
+    assert list(values) == [13.0, 13.5]
+    assert not (tmp_path / DOMAIN / "export").exists()
+
+    await coordinator.async_shutdown()  # writes pending samples
+    _times, values = await hass.async_add_executor_job(
+        coordinator.archive.series, "voltage"
+    )
+    assert list(values) == [13.0, 13.5, 14.0]
+    assert len(list((tmp_path / DOMAIN).glob("*/*.bin"))) == 1
+    (export,) = (tmp_path / DOMAIN / "export").glob("cc_cc_cc_cc_cc_cc_*.csv")
+    with export.open(newline="") as file:
+        assert [row["voltage"] for row in csv.DictReader(file)] == [
+            "13.0",
+            "13.5",
+            "14.0",
+        ]
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_archive_flush(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Test that pending samples are written once due, also without new samples."""
+
+    async def _mock_device_info(_self: MockBMS) -> BMSInfo:
+        return {}
+
+    monkeypatch.setattr(MockBMS, "device_info", _mock_device_info)
+    monkeypatch.setattr(hass.config, "config_dir", str(tmp_path))
+    config: Final = mock_config(
+        bms="archive_flush", options={CONF_ADVANCED_OPTIONS: {CONF_ARCHIVE: 7}}
+    )
+    config.add_to_hass(hass)
+    coordinator = BTBmsCoordinator(
+        hass, bt_discovery.device, MockBMS(ret_value={"voltage": 13.0}), config
+    )
+    assert coordinator.archive is not None
+    await coordinator._async_setup()
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    times, _values = await hass.async_add_executor_job(
+        coordinator.archive.series, "voltage"
+    )
+    assert not times, "batch not due yet"
+
+    # the device stays silent while the batch gets due
+    coordinator.archive._pending_since -= SampleArchive.BATCH_AGE
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SampleArchive.BATCH_AGE)
+    )
+    await hass.async_block_till_done()
+    _times, values = await hass.async_add_executor_job(
+        coordinator.archive.series, "voltage"
+    )
+    assert list(values) == [13.0]
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_archive_write_error(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a failed archive write is logged and later writes continue."""
+
+    writes: list[int] = []
+
+    def _mock_write(_self: SampleArchive, records: list[bytes]) -> None:
+        writes.append(len(records))
+        if len(writes) == 1:
+            raise OSError("disk full")
+
+    monkeypatch.setattr(hass.config, "config_dir", str(tmp_path))
+    monkeypatch.setattr(SampleArchive, "BATCH_RECORDS", 1)
+    monkeypatch.setattr(SampleArchive, "_write", _mock_write)
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        MockBMS(),
+        mock_config(
+            bms="archive_error",
+            options={CONF_ADVANCED_OPTIONS: {CONF_ARCHIVE: 7}},
+        ),
+    )
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.last_update_success
+    assert "failed to write samples: disk full" in caplog.text
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert writes == [1, 1]
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_refresh_coalescing(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that refresh requests do not query the device more than needed."""
+
+    answer: Final[asyncio.Event] = asyncio.Event()
+    queried: Final[asyncio.Event] = asyncio.Event()
+    queries: list[float] = []
+
+    async def _mock_update(_self: MockBMS) -> BMSSample:
+        queries.append(monotonic())
+        queried.set()
+        await answer.wait()
+        return {"voltage": 13.0}
+
+    monkeypatch.setattr(MockBMS, "async_update", _mock_update)
+    coordinator = BTBmsCoordinator(
+        hass, bt_discovery.device, MockBMS(), mock_config(bms="coalescing")
+    )
+
+    # request during a running update waits for its result
+    update: Final = hass.async_create_task(coordinator.async_refresh())
+    await queried.wait()
+    request: Final = hass.async_create_task(coordinator.async_request_refresh())
+    await asyncio.sleep(0)
+    assert not request.done()
+    answer.set()
+    await asyncio.gather(update, request)
+    assert len(queries) == 1
+    assert coordinator.data == {"voltage": 13.0}
+
+    # recent sample answers the request
+    await coordinator.async_request_refresh()
+    assert len(queries) == 1
+
+    coordinator._sample_time -= DEFAULT_FRESHNESS
+    await coordinator.async_request_refresh()
+    assert len(queries) == 2
+
+    await coordinator.async_shutdown()
 
 
 @pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
@@ -198,3 +662,539 @@ async def test_stale_recovery(
     assert coordinator.link_quality == 4
     assert flags["disconnect_called"]
     assert flags["reset"] is True, "Reset flag should be set on stale recovery"
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_backoff(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that updates of a failing device back off until it is seen again."""
+
+    bms: Final[MockBMS] = MockBMS(ret_value={})
+    coordinator = BTBmsCoordinator(
+        hass, bt_discovery.device, bms, mock_config(bms="backoff")
+    )
+
+    # a single failure is retried within the regular interval
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.backoff is None
+    assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL) + (
+        coordinator.phase
+    )
+
+    await coordinator.async_refresh()
+    assert (backoff := coordinator.backoff) is not None
+    assert timedelta(seconds=48) <= backoff <= timedelta(seconds=60)
+    assert coordinator.update_interval == backoff
+
+    for _ in range(10):
+        await coordinator.async_refresh()
+    assert (backoff := coordinator.backoff) is not None
+    assert timedelta(seconds=480) <= backoff <= timedelta(seconds=600)
+
+    # advertisements of a device that was not gone keep the backoff
+    coordinator._async_device_seen(bt_discovery, BluetoothChange.ADVERTISEMENT)
+    assert coordinator.backoff is not None
+
+    # advertisement of the device after being unavailable ends the backoff
+    bms._ret_value = {"voltage": 13.0}
+    coordinator._async_device_unseen(bt_discovery)
+    coordinator._async_device_seen(bt_discovery, BluetoothChange.ADVERTISEMENT)
+    assert coordinator.backoff is None
+    await hass.async_block_till_done()
+    assert coordinator.last_update_success
+    assert coordinator.backoff is None
+    assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL) + (
+        coordinator.phase
+    )
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_adaptive_keep_alive(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that the kept connection is released while the battery is idle."""
+
+    disconnects: list[bool] = []
+
+    async def _mock_disconnect(_self: MockBMS, reset: bool = False) -> None:
+        disconnects.append(reset)
+
+    monkeypatch.setattr(MockBMS, "disconnect", _mock_disconnect)
+
+    bms: Final[MockBMS] = MockBMS(ret_value={"voltage": 13.0, "current": 0.0})
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        bms,
+        mock_config(
+            bms="adaptive_keep_alive",
+            options={CONF_ADVANCED_OPTIONS: {CONF_ADAPTIVE_KEEP_ALIVE: True}},
+        ),
+    )
+    assert coordinator.adaptive_keep_alive
+
+    await coordinator.async_refresh()  # connect cost unknown, keep connection
+    assert coordinator.connect_cost is None
+    assert not disconnects
+
+    await coordinator.async_refresh()  # idle and reconnecting is cheap
+    assert coordinator.connect_cost is not None
+    assert disconnects == [False]
+
+    bms._ret_value["current"] = -5.0
+    await coordinator.async_refresh()  # active battery keeps connection
+    await coordinator.async_refresh()
+    assert disconnects == [False]
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_source_failover(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that repeated failures on a source switch to the next best one."""
+
+    def _scanner_device(source: str, rssi: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            ble_device=generate_ble_device(address=bt_discovery.address),
+            advertisement=generate_advertisement_data(rssi=rssi),
+            scanner=SimpleNamespace(source=source),
+        )
+
+    devices: Final[list[SimpleNamespace]] = [
+        _scanner_device("proxy_near", -60),
+        _scanner_device("proxy_far", -80),
+    ]
+    monkeypatch.setattr(
+        "custom_components.bms_ble.coordinator.async_scanner_devices_by_address",
+        lambda _hass, _addr, connectable: devices,
+    )
+    created: Final[list[MockBMS]] = []
+
+    def _factory(_device: BLEDevice) -> MockBMS:
+        created.append(MockBMS(ret_value={"voltage": 13.0}))
+        return created[-1]
+
+    failing: Final[MockBMS] = MockBMS(exc=BleakError())
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        failing,
+        mock_config(bms="failover"),
+        _factory,
+    )
+
+    # best source is selected on the first update
+    await coordinator.async_refresh()
+    assert coordinator.source == "proxy_near"
+    assert len(created) == 1 and coordinator.last_update_success
+
+    # failures on the source switch to the next one
+    created[0]._exception = BleakError()
+    for _ in range(3):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.source_stats["proxy_near"].consecutive_failures == 3
+    await coordinator.async_refresh()
+    assert coordinator.source == "proxy_far"
+    assert len(created) == 2 and coordinator.last_update_success
+
+    # kept connection stays on a working source despite a better signal
+    devices.append(_scanner_device("proxy_new", -40))
+    await coordinator.async_refresh()
+    assert coordinator.source == "proxy_far"
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_adaptive_interval(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that polling interval adapts to the rate of change of the samples."""
+
+    clock: list[float] = [0]
+    monkeypatch.setattr(
+        "custom_components.bms_ble.coordinator.monotonic", lambda: clock[0]
+    )
+    bms: Final[MockBMS] = MockBMS()
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        bms,
+        mock_config(
+            bms="adaptive",
+            options={
+                CONF_ADVANCED_OPTIONS: {CONF_MIN_INTERVAL: 10, CONF_MAX_INTERVAL: 60}
+            },
+        ),
+    )
+    assert coordinator.interval_range == (timedelta(seconds=10), timedelta(seconds=60))
+
+    await coordinator.async_refresh()  # first sample, nothing to compare to
+    assert coordinator.update_interval == timedelta(seconds=30) + coordinator.phase
+
+    clock[0] += 30
+    await coordinator.async_refresh()  # flat sample, back off
+    assert coordinator.update_interval == timedelta(seconds=45)
+
+    clock[0] += 45
+    bms._ret_value["current"] += 2  # change is slow for the time passed
+    await coordinator.async_refresh()  # flat sample, limited by maximum
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    for interval in (30, 15, 10):  # changing current, speed up to minimum
+        clock[0] += 10
+        bms._ret_value["current"] += 1
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=interval)
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_fixed_interval(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that polling interval stays fixed without adaptive range."""
+
+    bms: Final[MockBMS] = MockBMS()
+    coordinator = BTBmsCoordinator(
+        hass, bt_discovery.device, bms, mock_config(bms="fixed")
+    )
+    await coordinator.async_refresh()
+    assert (
+        coordinator.update_interval
+        == timedelta(seconds=UPDATE_INTERVAL) + coordinator.phase
+    )
+    for _ in range(3):
+        bms._ret_value["current"] = bms._ret_value.get("current", 0) + 5
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL)
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_deadband(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that changes within the deadbands do not update the data."""
+
+    bms: Final[MockBMS] = MockBMS(
+        ret_value={
+            "voltage": 13.2,
+            "current": 1.7,
+            "power": 22.44,
+            "cell_voltages": [3.3, 3.3, 3.3, 3.3],
+            "cycles": 23,
+        }
+    )
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        bms,
+        mock_config(
+            bms="deadband",
+            options={
+                CONF_ADVANCED_OPTIONS: {
+                    CONF_VOLTAGE_DEADBAND: 0.01,
+                    CONF_CURRENT_DEADBAND: 0.1,
+                }
+            },
+        ),
+    )
+    await coordinator.async_refresh()
+    published: Final[BMSSample] = coordinator.data
+
+    # jitter of cells, current and derived power stays within deadbands
+    bms._ret_value |= {
+        "current": 1.75,
+        "power": 23.1,
+        "cell_voltages": [3.3, 3.305, 3.295, 3.3],
+    }
+    await coordinator.async_refresh()
+    assert coordinator.data is published
+
+    # a cell changed beyond the deadband, relative to the published data
+    bms._ret_value["cell_voltages"] = [3.3, 3.312, 3.295, 3.3]
+    await coordinator.async_refresh()
+    assert coordinator.data == bms._ret_value
+
+    # fields without deadband always update
+    bms._ret_value["cycles"] = 24
+    await coordinator.async_refresh()
+    assert coordinator.data["cycles"] == 24
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_phase(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that polling of different devices is spread across the interval."""
+
+    phases: set[timedelta] = set()
+    for mac in ("cc:cc:cc:cc:cc:cc", "cc:cc:cc:cc:cc:cd", "11:22:33:44:55:66"):
+        coordinator = BTBmsCoordinator(
+            hass,
+            generate_ble_device(address=mac, name=bt_discovery.name),
+            MockBMS(),
+            mock_config(bms="phase", unique_id=mac),
+        )
+        assert timedelta(0) <= coordinator.phase < timedelta(seconds=UPDATE_INTERVAL)
+        phases.add(coordinator.phase)
+
+    assert len(phases) == 3, "phase shall differ per device"
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_push_mode(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that push mode publishes samples continuously without polling."""
+
+    bms: Final[MockBMS] = MockBMS()
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        bms,
+        mock_config(
+            bms="push",
+            options={
+                CONF_ADVANCED_OPTIONS: {CONF_PUSH_MODE: True, CONF_PUSH_INTERVAL: 0.01}
+            },
+        ),
+    )
+    assert coordinator.push_mode
+    assert coordinator.update_interval is None
+
+    updates: list[BMSSample] = []
+    coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.update_interval is None
+
+    bms._ret_value["current"] = 42
+    await asyncio.sleep(0.05)
+    assert coordinator.data.get(ATTR_CURRENT) == 42
+    assert len(updates) == 2, "unchanged samples shall not be published"
+
+    bms._exception = ValueError("plugin error")
+    await asyncio.sleep(0.05)
+    assert not coordinator.last_update_success
+    assert not coordinator._tasks["push"].done(), "push mode shall continue"
+
+    bms._exception = None
+    coordinator._seen.set()  # end the wait before retrying
+    await asyncio.sleep(0.05)
+    assert coordinator.last_update_success
+
+    bms._exception = BleakError()
+    await asyncio.sleep(0.05)
+    assert not coordinator.last_update_success
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_oversampling(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that samples between updates are published as aggregate."""
+
+    bms: Final[MockBMS] = MockBMS()
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        bms,
+        mock_config(
+            bms="oversampling",
+            options={CONF_ADVANCED_OPTIONS: {CONF_SAMPLE_INTERVAL: 0.01}},
+        ),
+    )
+
+    await coordinator.async_refresh()  # no samples yet, query directly
+    assert coordinator.data == bms._ret_value
+    assert not coordinator.extremes
+
+    bms._ret_value["current"] = 2.0
+    await asyncio.sleep(0.05)
+    bms._ret_value["current"] = 6.0
+    await asyncio.sleep(0.05)
+
+    await coordinator.async_refresh()
+    assert 2.0 < coordinator.data[ATTR_CURRENT] < 6.0
+    assert coordinator.data["cycles"] == 23
+    assert coordinator.extremes == {ATTR_CURRENT: (2.0, 6.0), ATTR_VOLTAGE: (13, 13)}
+    assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL)
+    # the history keeps every sample, not only the aggregate
+    assert {2.0, 6.0} <= set(coordinator.history.field(ATTR_CURRENT))
+
+    bms._exception = ValueError("plugin error")
+    await asyncio.sleep(0.05)
+    assert not coordinator._tasks["oversample"].done(), "oversampling shall continue"
+
+    bms._exception = BleakError()
+    coordinator._seen.set()  # end the backoff after repeated errors
+    await asyncio.sleep(0.05)
+    assert not coordinator._tasks["oversample"].done()
+
+    bms._exception = None
+    bms._ret_value["current"] = 8.0
+    coordinator._seen.set()  # end the wait before retrying
+    await asyncio.sleep(0.05)
+    await coordinator.async_refresh()
+    assert coordinator.data[ATTR_CURRENT] == 8.0
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_burst_serialized(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that burst samples neither overlap updates nor change the schedule."""
+
+    running: list[int] = []
+
+    async def _slow_update(self: MockBMS) -> BMSSample:
+        running.append(len(running))
+        await asyncio.sleep(0.01)
+        assert running.pop() == 0, "concurrent queries of the device"
+        self._ret_value["current"] += 5  # changing samples
+        return self._ret_value.copy()
+
+    monkeypatch.setattr(MockBMS, "async_update", _slow_update)
+    monkeypatch.setattr("custom_components.bms_ble.coordinator.BURST_INTERVAL", 0)
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        MockBMS(),
+        mock_config(
+            bms="burst",
+            options={
+                CONF_ADVANCED_OPTIONS: {CONF_MIN_INTERVAL: 10, CONF_MAX_INTERVAL: 60}
+            },
+        ),
+    )
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    coordinator.async_start_burst(timedelta(seconds=1))
+    await asyncio.sleep(0.1)
+    assert len(coordinator.burst) > 2
+    assert coordinator.interval_range[0] < timedelta(seconds=UPDATE_INTERVAL)
+    assert coordinator._interval == UPDATE_INTERVAL, "burst changed the interval"
+
+    # regular updates wait for the running burst query
+    await asyncio.gather(*(coordinator.async_refresh() for _ in range(3)))
+    assert coordinator.last_update_success
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_burst_failures(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test that a burst continues after failed samples and runs only once."""
+
+    monkeypatch.setattr("custom_components.bms_ble.coordinator.BURST_INTERVAL", 0)
+    bms: Final[MockBMS] = MockBMS(exc=ValueError("plugin error"))
+    coordinator = BTBmsCoordinator(
+        hass, bt_discovery.device, bms, mock_config(bms="burst_failures")
+    )
+
+    coordinator.async_start_burst(timedelta(seconds=0.2))
+    burst: Final = coordinator._tasks["burst"]
+    coordinator.async_start_burst(timedelta(seconds=0.2))  # joins running burst
+    assert coordinator._tasks["burst"] is burst
+
+    await asyncio.sleep(0.05)
+    assert not burst.done(), "burst shall continue after unexpected errors"
+
+    bms._exception = BleakError()
+    await asyncio.sleep(0.05)
+    assert not burst.done(), "burst shall continue after failed samples"
+
+    bms._exception = None
+    await burst
+    assert len(coordinator.burst) > 0
+    assert "burst" not in coordinator._tasks
+    assert coordinator._failures == 0, "burst failures shall not back off updates"
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_burst_push_mode(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that a burst in push mode captures the pushed samples only."""
+
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        MockBMS(),
+        mock_config(
+            bms="burst_push",
+            options={CONF_ADVANCED_OPTIONS: {CONF_PUSH_MODE: True}},
+        ),
+    )
+    coordinator.async_start_burst(timedelta(seconds=1))
+    assert coordinator.burst.active
+    assert "burst" not in coordinator._tasks
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_push_mode_needs_keep_alive(
+    bt_discovery: BluetoothServiceInfoBleak, hass: HomeAssistant
+) -> None:
+    """Test that push mode is not used without keeping the connection alive."""
+
+    coordinator = BTBmsCoordinator(
+        hass,
+        bt_discovery.device,
+        MockBMS(),
+        mock_config(
+            bms="push",
+            options={
+                CONF_ADVANCED_OPTIONS: {CONF_PUSH_MODE: True, CONF_KEEP_ALIVE: False}
+            },
+        ),
+    )
+    assert not coordinator.push_mode
+    assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL)
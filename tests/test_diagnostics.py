@@ -7,7 +7,7 @@ from habluetooth import BluetoothServiceInfoBleak
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.bms_ble.const import DOMAIN
+from custom_components.bms_ble.const import DEFAULT_SLOTS, DOMAIN
 from custom_components.bms_ble.coordinator import BTBmsCoordinator
 from custom_components.bms_ble.diagnostics import async_get_config_entry_diagnostics
 from homeassistant.components.bluetooth.const import DOMAIN as BT_DOMAIN
@@ -111,6 +111,7 @@ async def test_diagnostics(
         ),
         "advertisement_data": bt_discovery.as_dict() | {"source": REDACTED},
         "bms_link_quality": 50,
+        "connection_slots": {"total": DEFAULT_SLOTS, "active": 0, "waiting": 0},
         "bms_info": {
             "connections": {(BT_DOMAIN, ce.unique_id)},
             "identifiers": {(BT_DOMAIN, ce.unique_id), (DOMAIN, ce.unique_id)},
@@ -132,10 +133,24 @@ async def test_diagnostics(
             "problem": False,
             "voltage": 13,
         },
+        "bms_burst": [],
+        "bms_history": {
+            "samples": 1,
+            "capacity": 2880,  # 24h at 30s interval
+            "cells": 0,
+            "bytes": 2880 * (8 + 11 * 4),
+        },
         "update_data": {
-            "interval": timedelta(seconds=30),
+            "interval": timedelta(seconds=30) + ce.runtime_data.phase,
+            "interval_range": (timedelta(seconds=30), timedelta(seconds=30)),
+            "backoff": None,
             "last_exception": None,
             "last_update_success": True,
+            "phase": ce.runtime_data.phase,
+            "push_mode": False,
+            "adaptive_keep_alive": False,
+            "connect_cost": None,
+            "timeout": None,
         },
     }
 
@@ -158,6 +173,23 @@ async def test_diagnostics(
         "modified_at"
     ]
 
+    link_stats: Final[dict[str, Any]] = diag_data.pop("bms_link_statistics")
+    assert link_stats["quality"] == 50
+    assert link_stats["consecutive_failures"] == 0
+    assert link_stats["ewma_success"] == 1
+    assert link_stats["ewma_latency"] >= 0
+    assert link_stats["success_hour"] == link_stats["success_day"] == 1
+
+    latency: Final[dict[str, dict[str, float | None]]] = diag_data.pop("bms_latency")
+    assert latency["reset"] == {"last": None, "p50": None, "p95": None}
+    for phase in ("queue", "update", "publish"):
+        assert 0 <= latency[phase]["p50"] <= latency[phase]["p95"]
+
+    sources: Final[list[dict[str, Any]]] = diag_data.pop("bms_sources")
+    assert len(sources) == 1
+    assert sources[0]["active"]
+    assert sources[0]["consecutive_failures"] == 0
+
     assert repr(diag_data.pop("advertisement_data")) == repr(
         expected_diag_data.pop("advertisement_data")
     )
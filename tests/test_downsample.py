@@ -0,0 +1,51 @@
+"""Test the BLE Battery Management System time series downsampling."""
+
+from math import sin
+from typing import Final
+
+import pytest
+
+from custom_components.bms_ble.downsample import lttb, min_max
+
+TIMES: Final[list[float]] = [float(idx) for idx in range(100)]
+VALUES: Final[list[float]] = [sin(idx / 10) for idx in range(100)]
+
+
+@pytest.mark.parametrize("method", [lttb, min_max])
+def test_downsample_short(method) -> None:
+    """Test that series shorter than the requested points are kept."""
+
+    times, values = method(TIMES[:10], VALUES[:10], 10)
+    assert list(times) == TIMES[:10]
+    assert list(values) == VALUES[:10]
+
+
+def test_lttb() -> None:
+    """Test that LTTB keeps first, last and peak points."""
+
+    values: Final[list[float]] = [0.0] * 100
+    values[42] = 5.0
+    times, result = lttb(TIMES, values, 10)
+    assert len(times) == len(result) == 10
+    assert times[0] == 0 and times[-1] == 99
+    assert list(times) == sorted(times)
+    assert (42, 5.0) in zip(times, result, strict=True)
+
+    times, result = lttb(TIMES, VALUES, 20)
+    assert len(times) == 20
+    assert all(
+        value == pytest.approx(VALUES[int(time)])
+        for time, value in zip(times, result, strict=True)
+    )
+
+
+def test_min_max() -> None:
+    """Test that min/max bucketing keeps the extremes of each bucket in order."""
+
+    times, values = min_max(TIMES, VALUES, 10)
+    assert len(times) == len(values) == 10
+    assert list(times) == sorted(times)
+    assert max(values) == pytest.approx(max(VALUES))
+    assert min(values) == pytest.approx(min(VALUES))
+    # first bucket rises to the peak of the sine, i.e. minimum before maximum
+    assert list(times[:2]) == [0, 16]
@@ -0,0 +1,81 @@
+"""Test the BLE Battery Management System sample export."""
+
+import csv
+from pathlib import Path
+from typing import Final
+
+from custom_components.bms_ble.export import SampleExporter, flatten
+
+DAY: Final[float] = 1767225600.0  # 2026-01-01T00:00:00Z
+
+
+def test_flatten() -> None:
+    """Test that list fields are numbered and non-numeric fields are left out."""
+
+    assert flatten(
+        {
+            "voltage": 13.2,
+            "battery_charging": True,
+            "cell_voltages": [3.3, 3.31],
+            "temp_values": [21.5],
+            "problem_code": 0,
+        }
+    ) == {
+        "voltage": 13.2,
+        "battery_charging": True,
+        "cell_voltage_0": 3.3,
+        "cell_voltage_1": 3.31,
+        "temp_value_0": 21.5,
+        "problem_code": 0,
+    }
+
+
+def test_export_csv(tmp_path: Path) -> None:
+    """Test that samples are appended to daily CSV files."""
+
+    exporter: Final[SampleExporter] = SampleExporter(tmp_path, "bat_1", "csv")
+    exporter.add({"voltage": 13.2, "cell_voltages": [3.3, 3.31]}, DAY - 10)
+    exporter.add({"voltage": 13.3, "current": 1.5}, DAY + 10)
+    assert not exporter.due()
+    exporter.write(exporter.take())
+    exporter.add({"voltage": 13.4, "current": 1.0}, DAY + 20)
+    exporter.write(exporter.take())
+
+    with (tmp_path / "bat_1_2025-12-31.csv").open(newline="") as file:
+        assert list(csv.reader(file)) == [
+            ["timestamp", "voltage", "cell_voltage_0", "cell_voltage_1"],
+            ["2025-12-31T23:59:50+00:00", "13.2", "3.3", "3.31"],
+        ]
+    # columns of a day are set by its first batch, also after a restart
+    with (tmp_path / "bat_1_2026-01-01.csv").open(newline="") as file:
+        assert list(csv.reader(file)) == [
+            ["timestamp", "voltage", "current"],
+            ["2026-01-01T00:00:10+00:00", "13.3", "1.5"],
+            ["2026-01-01T00:00:20+00:00", "13.4", "1.0"],
+        ]
+    restarted: Final[SampleExporter] = SampleExporter(tmp_path, "bat_1", "csv")
+    restarted.add({"current": 0.5, "voltage": 13.5}, DAY + 30)
+    restarted.write(restarted.take())
+    lines: Final[list[str]] = (
+        (tmp_path / "bat_1_2026-01-01.csv").read_text().splitlines()
+    )
+    assert lines[-1] == "2026-01-01T00:00:30+00:00,13.5,0.5"
+
+
+def test_export_line_protocol(tmp_path: Path) -> None:
+    """Test that samples are appended in InfluxDB line protocol."""
+
+    exporter: Final[SampleExporter] = SampleExporter(
+        tmp_path, "my bat,1", "line_protocol"
+    )
+    exporter.add({"voltage": 13, "battery_charging": False, "cycles": 3}, DAY)
+    exporter.add({"cell_voltages": [3.3]}, DAY + 0.5)
+    exporter.write(exporter.take())
+
+    assert (tmp_path / "my bat,1_2026-01-01.txt").read_text().splitlines() == [
+        (
+            r"bms_ble,device=my\ bat\,1 voltage=13.0,battery_charging=false,cycles=3.0"
+            " 1767225600000000000"
+        ),
+        r"bms_ble,device=my\ bat\,1 cell_voltage_0=3.3 1767225600500000000",
+    ]
@@ -0,0 +1,81 @@
+"""Test the BLE Battery Management System sample history."""
+
+from math import isnan
+from time import time
+from typing import Final
+
+from custom_components.bms_ble.history import SampleHistory
+
+
+def test_history_ring() -> None:
+    """Test that the history keeps the latest samples in order."""
+
+    hist: Final[SampleHistory] = SampleHistory(3, 3600)
+    assert not len(hist)
+    assert not hist.timestamps()
+
+    now: Final[float] = time()
+    for idx in range(5):
+        hist.add({"voltage": 13.0 + idx, "current": float(idx)}, now - 5 + idx)
+    assert len(hist) == hist.capacity == 3
+    assert list(hist.timestamps()) == [now - 3, now - 2, now - 1]
+    assert list(hist.field("voltage")) == [15, 16, 17]
+    assert list(hist.field("current")) == [2, 3, 4]
+    assert all(isnan(value) for value in hist.field("battery_level"))
+    assert hist.nbytes == 3 * (8 + 4 * len(SampleHistory.FIELDS))
+
+
+def test_history_age() -> None:
+    """Test that samples exceeding the maximum age are dropped."""
+
+    hist: Final[SampleHistory] = SampleHistory(10, 60)
+    now: Final[float] = time()
+    hist.add({"voltage": 13.0}, now - 90)
+    hist.add({"voltage": 13.5}, now - 30)
+    hist.add({"voltage": 14.0}, now)
+    assert len(hist) == 2
+    assert list(hist.field("voltage")) == [13.5, 14.0]
+
+
+def test_history_cells() -> None:
+    """Test that cell voltages are kept once a sample contains them."""
+
+    hist: Final[SampleHistory] = SampleHistory(4, 3600)
+    now: Final[float] = time()
+    hist.add({"voltage": 13.0}, now - 2)
+    assert not hist.cell_count
+    hist.add({"cell_voltages": [3.25, 3.5]}, now - 1)
+    hist.add({"cell_voltages": [3.5]}, now)
+    assert hist.cell_count == 2
+    assert list(hist.cell(0))[1:] == [3.25, 3.5]
+    assert isnan(hist.cell(1)[0]) and isnan(hist.cell(1)[2])
+    assert hist.cell(1)[1] == 3.5
+
+
+def test_history_size() -> None:
+    """Test the number of samples allocated for a time span."""
+
+    assert SampleHistory.for_span(3600, 10).capacity == 360
+    assert SampleHistory.for_span(86400, 1).capacity == SampleHistory.MAX_SAMPLES
+    hist: Final[SampleHistory] = SampleHistory.for_span(0, 30)
+    hist.add({"voltage": 13.0})
+    assert not len(hist)
+    assert not hist.nbytes
+
+
+def test_history_series() -> None:
+    """Test selecting a time range of a field without missing values."""
+
+    hist: Final[SampleHistory] = SampleHistory(10, 3600)
+    now: Final[float] = time()
+    for idx in range(6):
+        hist.add(
+            {"current": float(idx)} if idx % 2 else {"cell_voltages": [3.5]},
+            now - 6 + idx,
+        )
+    times, values = hist.series("current", now - 5)
+    assert list(times) == [now - 5, now - 3, now - 1]
+    assert list(values) == [1, 3, 5]
+    assert list(hist.series("current", now - 4, now - 2)[1]) == [3]
+    assert list(hist.series(0)[1]) == [3.5, 3.5, 3.5]
+    assert not hist.series(1)[0]
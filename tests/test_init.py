@@ -1,13 +1,26 @@
 """Test the BLE Battery Management System integration initialization."""
 
-from typing import Final
+import asyncio
+from datetime import timedelta
+from typing import Any, Final
 
+from aiobmsble import BMSSample
 from habluetooth import BluetoothServiceInfoBleak
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.bms_ble.const import (
+    ATTR_RESTORED,
+    CONF_ADVANCED_OPTIONS,
+    CONF_FAST_SETUP,
+    CONF_PUSH_MODE,
+    DOMAIN,
+)
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.util import dt as dt_util
 
 from .bluetooth import inject_bluetooth_service_info_bleak
 from .conftest import mock_config, mock_devinfo_min, mock_exception, mock_update_min
@@ -126,3 +139,148 @@ async def test_unload_entry(
     assert len(hass.states.async_all(["sensor", "binary_sensor"])) == 0, (
         "Failed to remove platforms."
     )
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_init_restored(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that a restored sample makes setup succeed for an unreachable device."""
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_devinfo_min)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_exception)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+
+    cfg: MockConfigEntry = mock_config(bms="dummy_bms")
+    cfg.add_to_hass(hass)
+    sample_time: Final = dt_util.utcnow().replace(microsecond=0) - timedelta(minutes=5)
+    hass_storage[f"{DOMAIN}.{cfg.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{cfg.entry_id}",
+        "data": {"sample": {"voltage": 13.2}, "timestamp": sample_time.timestamp()},
+    }
+
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    await hass.async_block_till_done()
+    assert cfg.state is ConfigEntryState.LOADED
+
+    entity_id: Final = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{DOMAIN}-{format_mac(str(cfg.unique_id))}-voltage"
+    )
+    assert entity_id is not None
+    state = hass.states.get(entity_id)
+    assert state is not None and state.state == "13.2"
+    assert state.attributes[ATTR_RESTORED] == sample_time.isoformat()
+
+    assert await hass.config_entries.async_remove(cfg.entry_id)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.{cfg.entry_id}" not in hass_storage
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_init_restored_retry(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that a failed setup with a restored sample is retried in the background."""
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_exception)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_exception)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+
+    cfg: MockConfigEntry = mock_config(
+        bms="dummy_bms", options={CONF_ADVANCED_OPTIONS: {CONF_PUSH_MODE: True}}
+    )
+    cfg.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{cfg.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{cfg.entry_id}",
+        "data": {
+            "sample": {"voltage": 13.2},
+            "timestamp": dt_util.utcnow().timestamp(),
+        },
+    }
+
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    await hass.async_block_till_done()
+    assert cfg.state is ConfigEntryState.LOADED
+
+    # push mode runs, although no update succeeded yet
+    coordinator: Final = cfg.runtime_data
+    assert coordinator.push_mode
+    assert not coordinator._tasks["push"].done()
+    assert coordinator._unsub_adv is not None
+
+    assert await hass.config_entries.async_unload(cfg.entry_id)
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_init_fast_setup(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that fast setup creates entities before the device is queried."""
+
+    answer: Final[asyncio.Event] = asyncio.Event()
+
+    async def mock_slow_update(self) -> BMSSample:
+        await answer.wait()
+        return await mock_update_min(self)
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_devinfo_min)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_slow_update)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+
+    cfg: MockConfigEntry = mock_config(
+        bms="dummy_bms", options={CONF_ADVANCED_OPTIONS: {CONF_FAST_SETUP: True}}
+    )
+    cfg.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{cfg.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{cfg.entry_id}",
+        "data": {
+            "sample": {"voltage": 13.2},
+            "timestamp": dt_util.utcnow().timestamp(),
+        },
+    }
+
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    assert cfg.state is ConfigEntryState.LOADED
+
+    entity_id: Final = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{DOMAIN}-{format_mac(str(cfg.unique_id))}-voltage"
+    )
+    assert entity_id is not None
+    state = hass.states.get(entity_id)
+    assert state is not None and state.state == "13.2"
+    assert ATTR_RESTORED in state.attributes
+
+    # first sample from the device replaces the restored one
+    answer.set()
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state is not None and state.state == "12.3"
+    assert ATTR_RESTORED not in state.attributes
+
+    device: Final = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, bt_discovery.address)}
+    )
+    assert device is not None and device.manufacturer == "Mock manufacturer"
+
+    assert await hass.config_entries.async_unload(cfg.entry_id)
@@ -0,0 +1,85 @@
+"""Test the BLE Battery Management System integration metrics."""
+
+from typing import Final
+
+from habluetooth import BluetoothServiceInfoBleak
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.bms_ble import metrics
+from homeassistant.core import HomeAssistant
+
+from .bluetooth import inject_bluetooth_service_info_bleak
+from .conftest import mock_config, mock_devinfo_min, mock_exception, mock_update_min
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_metrics(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+) -> None:
+    """Test the latest samples and statistics in the text exposition format."""
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_devinfo_min)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_update_min)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+    cfg: Final[MockConfigEntry] = mock_config(bms="dummy_bms")
+    cfg.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    await hass.async_block_till_done()
+
+    renders: list[str] = []
+    render: Final = metrics.render
+
+    def _render(*args) -> dict[str, str]:
+        renders.append(args[1])
+        return render(*args)
+
+    monkeypatch.setattr(metrics, "render", _render)
+    client: Final = await hass_client()
+    resp = await client.get("/api/bms_ble/metrics")
+    assert resp.status == 200
+    assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    lines: list[str] = (await resp.text()).splitlines()
+    name: Final[str] = f'name="{cfg.title}",address="cc:cc:cc:cc:cc:cc"'
+    assert "# TYPE bms_ble_voltage gauge" in lines
+    assert f"bms_ble_voltage{{{name}}} 12.3" in lines
+    assert f"bms_ble_battery_charging{{{name}}} 0.0" in lines
+    assert f"bms_ble_up{{{name}}} 1.0" in lines
+    assert "# TYPE bms_ble_update_duration_seconds histogram" in lines
+    assert f'bms_ble_update_duration_seconds_count{{{name},phase="update"}} 1.0' in (
+        lines
+    )
+    assert any(line.startswith("bms_ble_source_attempts_total{") for line in lines)
+
+    # unchanged devices are not rendered again
+    assert (await (await client.get("/api/bms_ble/metrics")).text()).splitlines() == (
+        lines
+    )
+    assert renders == [cfg.title]
+
+    # a new signal strength is served without rendering the device again
+    bt_discovery.rssi = -85
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+    lines = (await (await client.get("/api/bms_ble/metrics")).text()).splitlines()
+    assert renders == [cfg.title]
+    assert "# TYPE bms_ble_rssi gauge" in lines
+    assert f"bms_ble_rssi{{{name}}} -85.0" in lines
+
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_exception)
+    await cfg.runtime_data.async_refresh()
+    lines = (await (await client.get("/api/bms_ble/metrics")).text()).splitlines()
+    assert renders == [cfg.title, cfg.title]
+    assert f"bms_ble_up{{{name}}} 0.0" in lines
+    assert f'bms_ble_update_failures_total{{{name},reason="bms_com_fail"}} 1.0' in (
+        lines
+    )
+
+    assert await hass.config_entries.async_unload(cfg.entry_id)
+    assert not await (await client.get("/api/bms_ble/metrics")).text()
@@ -0,0 +1,142 @@
+"""Test the BLE Battery Management System connection slot scheduler."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Final
+
+import pytest
+
+from custom_components.bms_ble.const import DEFAULT_SLOTS
+from custom_components.bms_ble.scheduler import SlotScheduler, async_get_scheduler
+from homeassistant.core import HomeAssistant
+
+
+class MockManager:
+    """Bluetooth manager reporting the slot allocations of a proxy."""
+
+    def __init__(self, slots: int, free: int, allocated: list[str]) -> None:
+        """Initialize the allocations of the proxy."""
+        self.alloc = SimpleNamespace(
+            source="proxy", slots=slots, free=free, allocated=allocated
+        )
+
+    def async_current_allocations(self, source: str) -> list[SimpleNamespace]:
+        """Return the allocations of the proxy only."""
+        return [self.alloc] if source == "proxy" else []
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+async def test_scheduler_singleton(hass: HomeAssistant) -> None:
+    """Test that all coordinators share the same scheduler."""
+
+    assert async_get_scheduler(hass) is async_get_scheduler(hass)
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+async def test_slots(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test number of slots reported by the Bluetooth manager."""
+
+    assert SlotScheduler.slots("unknown_source") == DEFAULT_SLOTS
+
+    manager: Final = MockManager(2, 1, [])
+    monkeypatch.setattr(
+        "custom_components.bms_ble.scheduler.get_manager", lambda: manager
+    )
+    assert SlotScheduler.slots("proxy") == 2
+
+
+async def test_slot_limit_fair(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that concurrent updates are limited per source and admitted in order."""
+
+    manager: Final = MockManager(2, 2, [])
+    monkeypatch.setattr(
+        "custom_components.bms_ble.scheduler.get_manager", lambda: manager
+    )
+    scheduler: Final[SlotScheduler] = SlotScheduler()
+    release: Final[asyncio.Event] = asyncio.Event()
+    order: list[int] = []
+
+    async def update(idx: int, source: str = "proxy") -> None:
+        async with scheduler.slot(source, f"dev_{idx}"):
+            order.append(idx)
+            await release.wait()
+
+    tasks: Final[list[asyncio.Task]] = [
+        asyncio.create_task(update(idx)) for idx in range(5)
+    ]
+    other: Final[asyncio.Task] = asyncio.create_task(update(99, "other"))
+    await asyncio.sleep(0)
+
+    assert order == [0, 1, 99]
+    assert scheduler.active("proxy") == 2
+    assert scheduler.waiting("proxy") == 3
+
+    # cancel a queued update, it must not consume a slot
+    tasks[2].cancel()
+    release.set()
+    await asyncio.gather(*tasks, other, return_exceptions=True)
+
+    assert order == [0, 1, 99, 3, 4]
+    assert scheduler.active("proxy") == 0
+    assert scheduler.waiting("proxy") == 0
+
+
+async def test_slots_held_elsewhere(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that kept connections and other integrations are taken into account."""
+
+    manager: Final = MockManager(3, 0, ["kept", "other_1", "other_2"])
+    monkeypatch.setattr(
+        "custom_components.bms_ble.scheduler.get_manager", lambda: manager
+    )
+    monkeypatch.setattr("custom_components.bms_ble.scheduler.SLOT_RECHECK", 0.01)
+    scheduler: Final[SlotScheduler] = SlotScheduler()
+    order: list[str] = []
+
+    async def update(address: str) -> None:
+        async with scheduler.slot("proxy", address):
+            order.append(address)
+
+    # the kept connection holds its slot already
+    await update("kept")
+    assert order == ["kept"]
+
+    # all slots are taken by other devices
+    waiter: Final[asyncio.Task] = asyncio.create_task(update("new"))
+    await asyncio.sleep(0.05)
+    assert not order[1:]
+    assert scheduler.waiting("proxy") == 1
+
+    # a slot released by another integration is found by the periodic check
+    manager.alloc.free = 1
+    await asyncio.wait_for(waiter, 1)
+    assert order == ["kept", "new"]
+    assert scheduler.waiting("proxy") == 0
+
+
+async def test_cancel_after_handover(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a slot handed over to a cancelled waiter is released again."""
+
+    manager: Final = MockManager(1, 1, [])
+    monkeypatch.setattr(
+        "custom_components.bms_ble.scheduler.get_manager", lambda: manager
+    )
+    scheduler: Final[SlotScheduler] = SlotScheduler()
+
+    async def update() -> None:
+        async with scheduler.slot("proxy", "waiter"):
+            pytest.fail("cancelled update must not run")
+
+    holder = scheduler.slot("proxy", "holder")
+    await holder.__aenter__()
+    waiter: Final[asyncio.Task] = asyncio.create_task(update())
+    await asyncio.sleep(0)
+    assert scheduler.waiting("proxy") == 1
+
+    # hand the slot over and cancel the waiter before it gets to run
+    await holder.__aexit__(None, None, None)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.active("proxy") == 0
+    assert scheduler.waiting("proxy") == 0
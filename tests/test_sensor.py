@@ -18,6 +18,9 @@ from custom_components.bms_ble.const import (
     ATTR_CYCLES,
     ATTR_DELTA_VOLTAGE,
     ATTR_DESIGN_CAP,
+    ATTR_LATENCY_PUBLISH,
+    ATTR_LATENCY_QUEUE,
+    ATTR_LATENCY_UPDATE,
     ATTR_LQ,
     ATTR_POWER,
     ATTR_RUNTIME,
@@ -126,6 +129,9 @@ async def test_update(
         f"{DEV_NAME}_{ATTR_DELTA_VOLTAGE}": STATE_UNKNOWN,
         f"{DEV_NAME}_{ATTR_DESIGN_CAP}": STATE_UNKNOWN,
         f"{DEV_NAME}_{ATTR_LQ}": "0",
+        f"{DEV_NAME}_{ATTR_LATENCY_PUBLISH}": STATE_UNKNOWN,
+        f"{DEV_NAME}_{ATTR_LATENCY_QUEUE}": STATE_UNKNOWN,
+        f"{DEV_NAME}_{ATTR_LATENCY_UPDATE}": STATE_UNKNOWN,
         f"{DEV_NAME}_highest_cell_voltage": STATE_UNKNOWN,
         f"{DEV_NAME}_lowest_cell_voltage": STATE_UNKNOWN,
         f"{DEV_NAME}_{ATTR_POWER}": "18.0",
@@ -135,7 +141,10 @@ async def test_update(
 
     monkeypatch.setattr(f"{bms_class}.async_update", patch_async_update)
 
-    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=UPDATE_INTERVAL))
+    # first poll after setup is shifted by the phase offset of up to one interval
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=2 * UPDATE_INTERVAL)
+    )
     await hass.async_block_till_done()
 
     # check that link quality has been updated, since the coordinator and the LQ sensor are
@@ -150,6 +159,13 @@ async def test_update(
         entity.entity_id: entity.state for entity in hass.states.async_all(["sensor"])
     }
 
+    # latency depends on the test system, thus only check plausibility
+    for key in (ATTR_LATENCY_PUBLISH, ATTR_LATENCY_QUEUE, ATTR_LATENCY_UPDATE):
+        assert float(data.pop(f"{DEV_NAME}_{key}")) >= 0
+        latency: State | None = hass.states.get(f"{DEV_NAME}_{key}")
+        assert latency is not None
+        assert 0 <= latency.attributes["p50"] <= latency.attributes["p95"]
+
     # check all sensor have correct updated value (translated names: EN)
     assert data == {
         f"{DEV_NAME}_{ATTR_VOLTAGE}": "17.0",
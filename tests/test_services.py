@@ -0,0 +1,91 @@
+"""Test the BLE Battery Management System integration actions."""
+
+import asyncio
+from typing import Any, Final
+
+from habluetooth import BluetoothServiceInfoBleak
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bms_ble.const import ATTR_DURATION, DOMAIN
+from custom_components.bms_ble.services import SERVICE_GET_BURST, SERVICE_START_BURST
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from .bluetooth import inject_bluetooth_service_info_bleak
+from .conftest import mock_config, mock_devinfo_min, mock_update_min
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_burst(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+) -> None:
+    """Test capturing the samples of a burst and returning them."""
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_devinfo_min)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_update_min)
+    monkeypatch.setattr("custom_components.bms_ble.coordinator.BURST_INTERVAL", 0.01)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+    cfg: Final[MockConfigEntry] = mock_config(bms="dummy_bms")
+    cfg.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    await hass.async_block_till_done()
+
+    response: dict[str, Any] | None = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BURST,
+        {ATTR_CONFIG_ENTRY_ID: cfg.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"active": False, "samples": []}
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_BURST,
+        {ATTR_CONFIG_ENTRY_ID: cfg.entry_id, ATTR_DURATION: 1},
+        blocking=True,
+    )
+    await asyncio.sleep(0.1)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BURST,
+        {ATTR_CONFIG_ENTRY_ID: cfg.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None and response["active"]
+    assert len(response["samples"]) > 1
+    assert response["samples"][0]["sample"] == await mock_update_min(None)
+
+    assert await hass.config_entries.async_unload(cfg.entry_id)
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_burst_invalid_entry(hass: HomeAssistant) -> None:
+    """Test that actions refuse unknown or not loaded config entries."""
+
+    cfg: Final[MockConfigEntry] = mock_config(bms="dummy_bms")
+    cfg.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(cfg.entry_id) is False
+
+    for entry_id, key in (
+        ("invalid_entry_id", "invalid_config_entry"),
+        (cfg.entry_id, "config_entry_not_loaded"),
+    ):
+        with pytest.raises(ServiceValidationError) as exc:
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_START_BURST,
+                {ATTR_CONFIG_ENTRY_ID: entry_id},
+                blocking=True,
+            )
+        assert exc.value.translation_key == key
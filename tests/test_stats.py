@@ -0,0 +1,144 @@
+"""Test the BLE Battery Management System link statistics."""
+
+from typing import Final
+
+import pytest
+
+from custom_components.bms_ble.stats import LatencyStats, LinkStats
+
+
+def test_link_quality() -> None:
+    """Test link quality over the last attempts including missed ones."""
+
+    stats: Final[LinkStats] = LinkStats()
+    assert stats.quality == 0
+    assert stats.consecutive_failures == 1
+    assert not stats.last_success
+
+    stats.record(True, 0.5, now=0)
+    assert stats.quality == 50
+    assert stats.last_success
+
+    stats.record(True, 1.5, missed=2, now=1)
+    assert stats.quality == 40  # 2 out of 5
+    assert stats.consecutive_failures == 0
+
+    for _ in range(3):
+        stats.record(False, now=2)
+    assert stats.consecutive_failures == 3
+    assert stats.quality == 25
+
+    for _ in range(LinkStats.WINDOW):
+        stats.record(True, now=3)
+    assert stats.quality == 100
+
+    stats.record(False, missed=2 * LinkStats.WINDOW, now=4)
+    assert stats.quality == 0
+    assert stats.consecutive_failures == LinkStats.WINDOW + 1
+
+
+def test_ewma() -> None:
+    """Test exponentially weighted averages of success and latency."""
+
+    stats: Final[LinkStats] = LinkStats()
+    assert stats.ewma_success is None
+    assert stats.ewma_latency is None
+
+    stats.record(True, 2.0, now=0)
+    assert stats.ewma_success == 1
+    assert stats.ewma_latency == 2.0
+
+    stats.record(False, 10.0, now=0)  # latency of failed attempts is ignored
+    assert stats.ewma_success == pytest.approx(0.9)
+    assert stats.ewma_latency == 2.0
+
+    stats.record(True, 1.0, now=0)
+    assert stats.ewma_success == pytest.approx(0.91)
+    assert stats.ewma_latency == pytest.approx(1.9)
+
+
+def test_time_windows() -> None:
+    """Test success ratios of the last hour and day."""
+
+    stats: Final[LinkStats] = LinkStats()
+    assert stats.hour_ratio(0) is None
+    assert stats.day_ratio(0) is None
+
+    stats.record(True, now=0)
+    stats.record(False, missed=2, now=1800)
+    assert stats.hour_ratio(1800) == pytest.approx(0.25)
+    assert stats.day_ratio(1800) == pytest.approx(0.25)
+
+    # first success left the hour window
+    assert stats.hour_ratio(3700) == 0
+    assert stats.day_ratio(3700) == pytest.approx(0.25)
+
+    assert stats.hour_ratio(2 * 86400) is None
+    assert stats.day_ratio(2 * 86400) is None
+
+    stats.record(True, now=2 * 86400)
+    assert stats.as_dict(now=2 * 86400) == {
+        "quality": 33,
+        "consecutive_failures": 0,
+        "ewma_success": pytest.approx(0.91),
+        "ewma_latency": None,
+        "success_hour": 1,
+        "success_day": 1,
+    }
+
+
+def test_latency() -> None:
+    """Test latest duration and percentiles of update phases."""
+
+    stats: Final[LatencyStats] = LatencyStats()
+    assert stats.last("update") is None
+    assert stats.percentile("update", 50) is None
+
+    for duration in range(1, 21):
+        stats.record("update", duration / 10)
+    stats.record("queue", 0.25)
+    assert stats.count("update") == 20
+    assert stats.last("update") == 2.0
+    assert stats.percentile("update", 50) == 1.0
+    assert stats.percentile("update", 95) == 1.9
+    assert stats.percentile("update", 0) == 0.1
+    assert stats.as_dict() == {
+        "queue": {"last": 0.25, "p50": 0.25, "p95": 0.25},
+        "reset": {"last": None, "p50": None, "p95": None},
+        "update": {"last": 2.0, "p50": 1.0, "p95": 1.9},
+        "publish": {"last": None, "p50": None, "p95": None},
+    }
+
+    # only the latest durations are considered
+    for _ in range(LatencyStats.SAMPLES):
+        stats.record("update", 0.5)
+    assert stats.percentile("update", 95) == 0.5
+
+
+def test_counters() -> None:
+    """Test total counts of attempts and failures by reason."""
+
+    stats: Final[LinkStats] = LinkStats()
+    stats.record(True, now=0)
+    stats.record(False, missed=2, now=1)
+    stats.count_failure("bms_timeout")
+    stats.count_failure("bms_timeout")
+    assert stats.attempts == 4
+    assert stats.successes == 1
+    assert stats.failures == {"bms_timeout": 2}
+
+
+def test_latency_histogram() -> None:
+    """Test cumulative histogram of all durations of a phase."""
+
+    stats: Final[LatencyStats] = LatencyStats()
+    for _ in range(LatencyStats.SAMPLES):
+        stats.record("update", 0.1)
+    stats.record("update", 2)
+    stats.record("update", 100)
+    counts, total = stats.histogram("update")
+    assert counts == [0, 100, 100, 100, 100, 101, 101, 101, 101, 101, 102]
+    assert total == pytest.approx(112)
+    assert stats.total("update") == LatencyStats.SAMPLES + 2
+    assert stats.count("update") == LatencyStats.SAMPLES
+    assert stats.histogram("queue") == ([0] * (len(LatencyStats.BUCKETS) + 1), 0)
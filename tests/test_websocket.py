@@ -0,0 +1,135 @@
+"""Test the BLE Battery Management System integration websocket commands."""
+
+from typing import Any, Final
+
+from habluetooth import BluetoothServiceInfoBleak
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.bms_ble.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .bluetooth import inject_bluetooth_service_info_bleak
+from .conftest import mock_config, mock_devinfo_min, mock_update_full, mock_update_min
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_subscribe(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that subscribers receive the changed fields of new samples."""
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_devinfo_min)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_update_min)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+    cfg: Final[MockConfigEntry] = mock_config(bms="dummy_bms")
+    cfg.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    await hass.async_block_till_done()
+
+    client: Final = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe", "entry_ids": [cfg.entry_id], "throttle": 0}
+    )
+    msg: dict[str, Any] = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert msg["event"] == {"samples": {cfg.entry_id: await mock_update_min(None)}}
+
+    # only fields that changed are sent
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_update_full)
+    await cfg.runtime_data.async_refresh()
+    msg = await client.receive_json()
+    full: Final[dict[str, Any]] = dict(await mock_update_full(None))
+    assert msg["event"] == {
+        "samples": {cfg.entry_id: {k: v for k, v in full.items() if k != "voltage"}}
+    }
+
+    # removed fields are sent as None
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_update_min)
+    await cfg.runtime_data.async_refresh()
+    msg = await client.receive_json()
+    assert msg["event"] == {
+        "samples": {
+            cfg.entry_id: {
+                k: None for k in full if k not in ("voltage", "battery_charging")
+            }
+            | {"battery_charging": False}
+        }
+    }
+
+    assert await hass.config_entries.async_unload(cfg.entry_id)
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+async def test_subscribe_invalid_entry(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test that subscriptions to unknown config entries are refused."""
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    client: Final = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe", "entry_ids": ["invalid_entry_id"]}
+    )
+    msg: Final[dict[str, Any]] = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
+
+
+@pytest.mark.usefixtures("enable_bluetooth", "patch_default_bleak_client")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+@pytest.mark.parametrize("method", ["lttb", "min_max"])
+async def test_history(
+    monkeypatch: pytest.MonkeyPatch,
+    bt_discovery: BluetoothServiceInfoBleak,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    method: str,
+) -> None:
+    """Test querying the history of fields and cell voltages."""
+
+    bms_class: Final[str] = "aiobmsble.bms.dummy_bms.BMS"
+    monkeypatch.setattr(f"{bms_class}.device_info", mock_devinfo_min)
+    monkeypatch.setattr(f"{bms_class}.async_update", mock_update_min)
+
+    inject_bluetooth_service_info_bleak(hass, bt_discovery)
+    cfg: Final[MockConfigEntry] = mock_config(bms="dummy_bms")
+    cfg.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(cfg.entry_id)
+    await hass.async_block_till_done()
+
+    client: Final = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": f"{DOMAIN}/history",
+            "entry_id": cfg.entry_id,
+            "fields": ["voltage", "current"],
+            "cells": [0],
+            "points": 10,
+            "method": method,
+        }
+    )
+    msg: Final[dict[str, Any]] = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["fields"]["voltage"]["value"] == [12.3]
+    assert len(msg["result"]["fields"]["voltage"]["time"]) == 1
+    assert msg["result"]["fields"]["current"] == {"time": [], "value": []}
+    assert msg["result"]["cells"] == [{"time": [], "value": []}]
+
+    # archive is disabled by default
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/history", "entry_id": cfg.entry_id, "archive": True}
+    )
+    error: Final[dict[str, Any]] = await client.receive_json()
+    assert error["error"]["code"] == "not_supported"
+
+    assert await hass.config_entries.async_unload(cfg.entry_id)